@@ -20,6 +20,10 @@ def get_intraday_candles_dir() -> str:
     return read_file()["candles_intraday"]
 
 
+def get_metadata_dir() -> str:
+    return read_file()["metadata"]
+
+
 def get_news_dir() -> str:
     return read_file()["news"]
 
@@ -0,0 +1,160 @@
+import os
+import time
+import logging
+import pandas as pd
+import yfinance as yf
+
+from data.candles import Candles
+from utils.dates import is_stale
+from utils.concurrency import map_concurrent
+
+
+class CandleLoader:
+    """
+    Warms the daily candle caches of a ticker universe with batched downloads.
+
+    Every ticker's cache is checked first; stale tickers are grouped by the
+    start date they need (tickers without a cache share one full-`period`
+    group), each group is downloaded `chunk_size` symbols per request, and
+    the result is split back into the per-ticker files `Candles` reads.
+    """
+
+    def __init__(
+        self,
+        tickers: list,
+        cache_dir: str,
+        period: str = "max",
+        storage: str = "csv",
+        chunk_size: int = 200,
+        stale_threshold: int = 3,
+        workers: int = 1,
+        rate_limit: float = None,
+        retries: int = 2,
+        log: bool = True,
+    ):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.cache_dir = cache_dir
+        self.period = period
+        self.storage = storage
+        self.chunk_size = chunk_size
+        self.stale_threshold = stale_threshold
+        self.workers = workers
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.log = log
+
+        self.candles = {
+            t: Candles(
+                t, cache_dir, period=period, storage=storage, incremental=True, log=False
+            )
+            for t in self.tickers
+        }
+        self.status = {}
+        self.errors = {}
+        self.requests = 0
+
+    def load(self) -> dict:
+        """
+        Bring every ticker's cache up to date.
+
+        Returns:
+        --------
+        dict : ticker -> "fresh", "created", "updated", "missing" or "failed"
+        """
+        start = time.time()
+        self.status, self.errors, self.requests = {}, {}, 0
+        cached, groups = self._plan()
+        jobs = [
+            (group, chunk)
+            for group, tickers in groups.items()
+            for chunk in self._chunks(tickers)
+        ]
+        results = map_concurrent(
+            self._download_job,
+            jobs,
+            workers=self.workers,
+            rate_limit=self.rate_limit,
+            retries=self.retries,
+            return_exceptions=True,
+        )
+        for (group, chunk), data in zip(jobs, results):
+            for ticker in chunk:
+                if isinstance(data, Exception):
+                    self.errors[ticker] = data
+                    self.status[ticker] = "failed"
+                    continue
+                self.status[ticker] = self._store(ticker, data, cached.get(ticker))
+        if self.log:
+            counts = pd.Series(self.status, dtype=object).value_counts().to_dict()
+            logging.info(
+                f"Loaded candles for {len(self.tickers)} tickers with "
+                f"{self.requests} requests in {time.time() - start:.2f}s: {counts}"
+            )
+        return self.status
+
+    def get_candles(self, ticker: str) -> pd.DataFrame:
+        return self.candles[ticker.upper()].get_candles()
+
+    def _plan(self):
+        # group key -> tickers, a date means "download from this date".
+        cached, groups = {}, {}
+        for ticker, candles in self.candles.items():
+            df = pd.DataFrame()
+            if os.path.exists(candles.file_path):
+                df = candles._read_file()
+            if df.empty:
+                groups.setdefault(None, []).append(ticker)
+                continue
+            last = df.index[-1]
+            if is_stale(last.date(), stale_threshold=self.stale_threshold):
+                cached[ticker] = df
+                # The last cached bar is requested again so a partial bar
+                # is replaced, as in `Candles`.
+                groups.setdefault(last.date(), []).append(ticker)
+            else:
+                self.status[ticker] = "fresh"
+        return cached, groups
+
+    def _chunks(self, tickers: list) -> list:
+        return [
+            tickers[i : i + self.chunk_size]
+            for i in range(0, len(tickers), self.chunk_size)
+        ]
+
+    def _download_job(self, job):
+        group, chunk = job
+        return self._download(group, chunk)
+
+    def _download(self, start, tickers: list) -> pd.DataFrame:
+        if self.log:
+            since = self.period if start is None else f"since {start}"
+            logging.info(f"Downloading {len(tickers)} tickers ({since})...")
+        kwargs = {"period": self.period} if start is None else {"start": start}
+        self.requests += 1
+        return yf.download(
+            tickers, interval="1d", group_by="ticker", progress=False, **kwargs
+        )
+
+    def _store(self, ticker: str, data: pd.DataFrame, df: pd.DataFrame = None) -> str:
+        new_df = self._split(data, ticker)
+        if new_df.empty:
+            return "fresh" if df is not None else "missing"
+        candles = self.candles[ticker]
+        if df is None:
+            candles._write_candles(new_df)
+            return "created"
+        candles.append_candles(new_df, df)
+        return "updated"
+
+    @staticmethod
+    def _split(data: pd.DataFrame, ticker: str) -> pd.DataFrame:
+        if data is None or data.empty:
+            return pd.DataFrame()
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                return pd.DataFrame()
+            data = data[ticker]
+        # Symbols with a shorter history come back as NaN rows in the batch.
+        data = data.dropna(how="all")
+        data.columns.name = None
+        return data
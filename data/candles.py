@@ -1,10 +1,105 @@
 import os
+import glob
+import threading
 import pandas as pd
 import yfinance as yf
+import datetime as dt
 from utils.dates import is_stale
+from data.resample import candle_resampler
+from collections import OrderedDict
 import logging
 
 
+class CandleCache:
+    """
+    Parsed candle frames shared by every `Candles` instance in the process.
+
+    Entries are keyed by cache path (plus an optional variant, for readers
+    that parse the same file differently) and validated against the file's
+    mtime and size (every part file for directory stores), so a write from
+    any instance or process invalidates them. The least recently used frames are
+    evicted once the total memory exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024**2):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path: str, loader, variant=None) -> pd.DataFrame:
+        key = (path, variant)
+        signature = self._signature(path)
+        with self.lock:
+            entry = self.frames.get(key)
+            if entry is not None and signature is not None and entry[0] == signature:
+                self.hits += 1
+                self.frames.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+        df = loader()
+        if not df.empty:
+            self.put(path, df, variant)
+        return df
+
+    def put(self, path: str, df: pd.DataFrame, variant=None):
+        key = (path, variant)
+        signature = self._signature(path)
+        if signature is None:
+            return
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self.lock:
+            self._remove(key)
+            if nbytes > self.max_bytes:
+                return
+            self.frames[key] = (signature, df, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self.frames)))
+
+    def invalidate(self, path: str = None):
+        with self.lock:
+            if path is None:
+                self.frames.clear()
+                self.nbytes = 0
+            else:
+                for key in [k for k in self.frames if k[0] == path]:
+                    self._remove(key)
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.frames),
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: tuple):
+        entry = self.frames.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            if os.path.isdir(path):
+                return tuple(
+                    (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                    for e in sorted(os.scandir(path), key=lambda e: e.name)
+                    if e.is_file()
+                )
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+
+candle_cache = CandleCache()
+
+
 class Candles:
     def __init__(
         self,
@@ -13,28 +108,56 @@ class Candles:
         daily: bool = True,
         period: str = "max",
         log: bool = True,
+        incremental: bool = False,
+        storage: str = "csv",
+        max_parts: int = 32,
     ):
         self.ticker = ticker.upper()
         self.cache_dir = cache_dir
         self.daily = daily
         self.period = period
         self.log = log
-        self.file_path = os.path.join(cache_dir, f"{self.ticker}.csv")
+        # Incremental mode only downloads bars after the last cached one and
+        # appends them; "parquet" storage is always incremental and keeps
+        # appended parts under one directory per ticker.
+        if storage not in ("csv", "parquet"):
+            raise ValueError(f"storage must be 'csv' or 'parquet', got '{storage}'")
+        self.storage = storage
+        self.incremental = incremental or storage == "parquet"
+        self.max_parts = max_parts
+        if self.storage == "parquet":
+            self.file_path = os.path.join(cache_dir, self.ticker)
+        else:
+            self.file_path = os.path.join(cache_dir, f"{self.ticker}.csv")
         if self.daily:
             self.interval = "1d"
         else:
-            self.interval = "1min"
+            # Intraday bars live in their own day-partitioned store.
+            from data.intraday import IntradayCandles
+
+            self.interval = "1m"
+            self.intraday = IntradayCandles(
+                self.ticker, cache_dir, interval=self.interval, log=log
+            )
 
     def get_candles(self) -> pd.DataFrame:
+        # Copy so callers can't mutate the frame shared through candle_cache.
+        return self._get_candles().copy()
+
+    def _get_candles(self) -> pd.DataFrame:
+        if not self.daily:
+            return self.intraday.get_candles()
+        if self.incremental:
+            return self._get_incremental_candles()
         df = self._read_file()
         if df.empty:
             df = self._fetch_candles()
             df.to_csv(self.file_path)
             return df
         else:
-            index = df.index.to_list()
-            stale = is_stale(index[-1], stale_threshold=3)
+            stale = is_stale(df.index[-1], stale_threshold=3)
             if stale:
+                index = df.index.to_list()
                 new_df = self._fetch_candles()
                 new_index = new_df.index.to_list()
                 unique_index = list(set(new_index) - set(index))
@@ -43,7 +166,48 @@ class Candles:
                 df.to_csv(self.file_path)
             return df
 
+    def _get_incremental_candles(self) -> pd.DataFrame:
+        df = self._read_file()
+        if df.empty:
+            df = self._fetch_candles()
+            self._write_candles(df)
+            return df
+        last = df.index[-1]
+        if is_stale(last.date(), stale_threshold=3):
+            # Re-request the last cached bar too, so a bar cached mid-session
+            # is replaced by its final values.
+            new_df = self._fetch_candles(start=last.date())
+            df = self.append_candles(new_df, df)
+        return df
+
+    def append_candles(self, new_df: pd.DataFrame, df: pd.DataFrame = None):
+        """
+        Append bars to the cache without rewriting it.
+
+        Bars at or after the first new timestamp win over cached ones on the
+        next read. Returns the merged frame on a sorted DatetimeIndex.
+        """
+        if df is None:
+            df = self._read_file()
+        new_df = self._normalize(new_df)
+        if new_df.empty:
+            return df
+        if df.empty:
+            self._write_candles(new_df)
+            return new_df
+        new_df = new_df.reindex(columns=df.columns)
+        self._append_file(new_df)
+        merged = pd.concat([df.loc[df.index < new_df.index[0]], new_df], axis=0)
+        merged = self._normalize(merged)
+        candle_cache.put(self.file_path, merged, self.incremental)
+        return merged
+
     def _read_file(self):
+        return candle_cache.get(self.file_path, self._load_file, self.incremental)
+
+    def _load_file(self):
+        if self.storage == "parquet":
+            return self._read_parts()
         try:
             df = pd.read_csv(self.file_path)
             cols = df.columns.to_list()
@@ -54,24 +218,129 @@ class Candles:
                 df.set_index("Date", inplace=True)
             if self.log:
                 logging.info(f"{self.ticker} candles loaded from cache.")
+            if self.incremental:
+                df = self._normalize(df)
+            else:
+                # Files appended to before tails were truncated can repeat
+                # the last bar of each refresh; the later row is the revision.
+                df = df[~pd.to_datetime(df.index).duplicated(keep="last")]
             return df
         except FileNotFoundError as e:
             logging.exception(e)
             return pd.DataFrame()
 
-    def _fetch_candles(self):
+    def _read_parts(self) -> pd.DataFrame:
+        parts = self._parts()
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(p) for p in parts], axis=0)
+        if self.log:
+            logging.info(f"{self.ticker} candles loaded from cache.")
+        df = self._normalize(df)
+        if len(parts) > self.max_parts:
+            self._write_candles(df)
+        return df
+
+    def _parts(self) -> list:
+        return sorted(glob.glob(os.path.join(self.file_path, "part-*.parquet")))
+
+    def _write_candles(self, df: pd.DataFrame):
+        df = self._normalize(df)
+        if self.storage == "csv":
+            df.to_csv(self.file_path)
+            candle_cache.put(self.file_path, df, self.incremental)
+            return
+        # A full write compacts every appended part into a single file.
+        old_parts = self._parts()
+        os.makedirs(self.file_path, exist_ok=True)
+        path = os.path.join(self.file_path, "part-00000.parquet")
+        tmp_path = path + ".tmp"
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        for part in old_parts:
+            if part != path:
+                os.remove(part)
+        candle_cache.put(self.file_path, df, self.incremental)
+
+    def _append_file(self, new_df: pd.DataFrame):
+        if self.storage == "csv":
+            # Drop the re-requested bars first so every reader, not just the
+            # incremental one, sees each date once.
+            self._truncate_csv(new_df.index[0])
+            new_df.to_csv(self.file_path, mode="a", header=False)
+            return
+        parts = self._parts()
+        number = int(os.path.basename(parts[-1])[5:10]) + 1 if parts else 0
+        path = os.path.join(self.file_path, f"part-{number:05d}.parquet")
+        new_df.to_parquet(path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+
+    def _truncate_csv(self, start: pd.Timestamp, block_size: int = 64 * 1024):
+        # Cut the file back to the last row dated before `start`, reading
+        # backwards so only the tail is touched.
+        with open(self.file_path, "rb+") as file:
+            end = file.seek(0, os.SEEK_END)
+            position, tail, cut = end, b"", end
+            while cut > 0:
+                line_end = cut - position
+                newline = tail.rfind(b"\n", 0, max(line_end - 1, 0))
+                if newline == -1 and position > 0:
+                    read = min(block_size, position)
+                    position -= read
+                    file.seek(position)
+                    tail = file.read(read) + tail
+                    continue
+                line = tail[newline + 1 : line_end].strip()
+                if line:
+                    try:
+                        date = pd.Timestamp(line.split(b",", 1)[0].decode())
+                    except ValueError:  # Header row.
+                        break
+                    if date < start:
+                        break
+                cut = position + newline + 1
+            file.truncate(cut)
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Sorted, unique DatetimeIndex; later rows win on duplicates.
+        if df.empty:
+            return df
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "Date"
+        df = df[~df.index.duplicated(keep="last")]
+        return df.sort_index(kind="mergesort")
+
+    def _fetch_candles(self, start: dt.date = None):
         if self.log:
             logging.info(f"Fetching {self.ticker} candles from Yahoo Finance...")
 
-        df = yf.download(
-            self.ticker,
-            period=self.period,
-            interval=self.interval,
-            multi_level_index=False,
-        )
+        if start is None:
+            df = yf.download(
+                self.ticker,
+                period=self.period,
+                interval=self.interval,
+                multi_level_index=False,
+            )
+        else:
+            df = yf.download(
+                self.ticker,
+                start=start,
+                interval=self.interval,
+                multi_level_index=False,
+            )
         return df
 
     ### Functionality
+    def resample(self, rule: str, closed: str = None, label: str = None):
+        """
+        Cached bars aggregated to a coarser timeframe, e.g. "W-FRI", "ME",
+        "15min". Derived from the cache instead of another download.
+        """
+        return candle_resampler.resample(self, rule, closed, label).copy()
+
     def get_spot_price(self):
-        candles = self.get_candles()
+        if not self.daily:
+            return self.intraday.get_spot_price()
+        candles = self._get_candles()
         return candles["Close"].iloc[-1]
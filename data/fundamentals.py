@@ -0,0 +1,145 @@
+import logging
+import pandas as pd
+
+from data.statements import FinancialStatements
+from utils.concurrency import map_concurrent
+
+
+class FundamentalsPanel:
+    """
+    Statements of a ticker universe aligned into one panel.
+
+    `data` has a (ticker, item) row index and one column per fiscal period
+    (annual or quarterly `pd.Period`), so tickers with different report
+    dates line up. Growth, margins and expense ratios are computed for every
+    ticker at once and come back with (ticker, metric) rows.
+    """
+
+    statement_types = ["income_statement", "balance_sheet", "cash_flow"]
+
+    growth_items = {
+        "revenue": "Total Revenue",
+        "earnings": "Net Income",
+        "eps": "Basic EPS",
+    }
+    margin_items = {
+        "gross_margin": "Gross Profit",
+        "operating_margin": "Operating Income",
+        "profit_margin": "Net Income",
+        "fcf_margin": "Free Cash Flow",
+    }
+    expense_items = {
+        "R&D": "Research And Development",
+        "SG&A": "Selling General And Administration",
+        "S&M": "Selling And Marketing Expense",
+        "G&A": "General And Administrative Expense",
+    }
+
+    def __init__(
+        self,
+        tickers: list,
+        cache_dir: str,
+        candle_dir: str,
+        annual: bool = True,
+        workers: int = 1,
+        rate_limit: float = None,
+        log: bool = True,
+    ):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.cache_dir = cache_dir
+        self.candle_dir = candle_dir
+        self.annual = annual
+        self.freq = "Y" if annual else "Q"
+        self.workers = workers
+        self.rate_limit = rate_limit
+        self.log = log
+
+        self.data = pd.DataFrame()
+        self.errors = {}
+
+    def load(self) -> pd.DataFrame:
+        self.errors = {}
+        results = map_concurrent(
+            self._load_ticker,
+            self.tickers,
+            workers=self.workers,
+            rate_limit=self.rate_limit,
+            retries=0,
+            return_exceptions=True,
+        )
+        frames = {}
+        for ticker, result in zip(self.tickers, results):
+            if isinstance(result, Exception):
+                self.errors[ticker] = result
+            else:
+                frames[ticker] = result
+        if not frames:
+            self.data = pd.DataFrame()
+            return self.data
+        self.data = pd.concat(frames, names=["ticker", "item"]).sort_index(axis=1)
+        if self.log:
+            logging.info(
+                f"Loaded statements for {len(frames)}/{len(self.tickers)} tickers, "
+                f"{len(self.errors)} failed."
+            )
+        return self.data
+
+    def item(self, name: str) -> pd.DataFrame:
+        """Ticker x period values of one line item, NaN where it's missing."""
+        if self.data.empty:
+            self.load()
+        tickers = self.data.index.get_level_values("ticker").unique()
+        if name in self.data.index.get_level_values("item"):
+            values = self.data.xs(name, level="item")
+        else:
+            values = pd.DataFrame()
+        return values.reindex(index=tickers, columns=self.data.columns)
+
+    def growth(self) -> pd.DataFrame:
+        # Same formula as handle_growth, against the previous fiscal period.
+        metrics = {}
+        for metric, name in self.growth_items.items():
+            values = self.item(name)
+            previous = values.shift(1, axis=1)
+            metrics[metric] = (values - previous) / previous * 100
+        return self._stack(metrics)
+
+    def margins(self, return_percent: bool = True) -> pd.DataFrame:
+        return self._ratios(self.margin_items, return_percent)
+
+    def expense_ratios(self, return_percent: bool = True) -> pd.DataFrame:
+        return self._ratios(self.expense_items, return_percent)
+
+    @staticmethod
+    def latest(metrics: pd.DataFrame) -> pd.DataFrame:
+        """Ticker x metric table of each row's most recent reported value."""
+        return metrics.ffill(axis=1).iloc[:, -1].unstack("metric")
+
+    def _ratios(self, items: dict, return_percent: bool) -> pd.DataFrame:
+        multiplier = 100 if return_percent else 1
+        revenue = self.item("Total Revenue")
+        metrics = {
+            metric: self.item(name) / revenue * multiplier
+            for metric, name in items.items()
+        }
+        return self._stack(metrics)
+
+    def _stack(self, metrics: dict) -> pd.DataFrame:
+        stacked = pd.concat(metrics, names=["metric", "ticker"])
+        stacked = stacked.swaplevel("metric", "ticker")
+        tickers = self.data.index.get_level_values("ticker").unique()
+        order = pd.MultiIndex.from_product([tickers, list(metrics)])
+        return stacked.reindex(order).rename_axis(["ticker", "metric"])
+
+    def _load_ticker(self, ticker: str):
+        statements = FinancialStatements(
+            ticker, self.cache_dir, self.candle_dir
+        ).get_statements(self.annual, candle_rows=False)
+        frames = [statements[k] for k in self.statement_types if k in statements]
+        df = pd.concat(frames, axis=0)
+        # Items like Net Income appear in several statements.
+        df = df.loc[~df.index.duplicated(keep="first")]
+        df.columns = pd.to_datetime(df.columns).to_period(self.freq)
+        df = df.loc[:, ~df.columns.duplicated(keep="last")]
+        df.index.name = "item"
+        return df.apply(pd.to_numeric, errors="coerce")
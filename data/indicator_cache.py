@@ -0,0 +1,177 @@
+import os
+import json
+import logging
+import pandas as pd
+
+from data.candles import candle_cache
+from utils.streaming import (
+    StreamingIndicator,
+    StreamingSMA,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingMACD,
+    StreamingBBands,
+)
+
+
+class IndicatorCache:
+    """
+    Indicator series persisted next to the candle caches.
+
+    Each (ticker, indicator, params) gets
+    `{cache_dir}/indicators/{TICKER}/{key}.parquet` plus a JSON sidecar with
+    the last bar date and close and the streaming indicator state. When new
+    candles arrive only the bars after the stamped date are folded in (the
+    stamped bar itself is revised if its close changed); unchanged candles
+    are served straight from the file through the shared candle cache.
+    """
+
+    indicators = {
+        "sma": StreamingSMA,
+        "ema": StreamingEMA,
+        "rsi": StreamingRSI,
+        "macd": StreamingMACD,
+        "bbands": StreamingBBands,
+    }
+
+    def __init__(self, cache_dir: str, log: bool = True):
+        self.cache_dir = cache_dir
+        self.log = log
+
+    def get(self, candles, indicator: str, **params) -> pd.DataFrame:
+        """
+        Indicator values for every cached bar of `candles`.
+
+        Parameters:
+        -----------
+        candles : Candles
+            Source of the closes, its ticker names the cache entry
+        indicator : str
+            One of `indicators`
+        **params :
+            Indicator parameters, e.g. length=14
+
+        Returns:
+        --------
+        pd.DataFrame : Indexed by Date with pandas_ta column names
+        """
+        streaming = self._streaming(indicator, params)
+        path = self.path(candles.ticker, indicator, streaming.params)
+        close = self._closes(candles)
+        if close.empty:
+            return pd.DataFrame()
+
+        meta = self._read_meta(path)
+        if meta is not None:
+            last_date = pd.Timestamp(meta["last_date"])
+            if last_date in close.index:
+                cached = self._read_values(path)
+                if len(cached) == meta["rows"] and cached.index[-1] == last_date:
+                    return self._extend(path, cached, meta, close).copy()
+        return self._compute(path, streaming, close).copy()
+
+    def path(self, ticker: str, indicator: str, params: dict) -> str:
+        key = "_".join([indicator] + [f"{k}={params[k]}" for k in sorted(params)])
+        return os.path.join(
+            self.cache_dir, "indicators", ticker.upper(), f"{key}.parquet"
+        )
+
+    def invalidate(self, ticker: str, indicator: str = None):
+        ticker_dir = os.path.join(self.cache_dir, "indicators", ticker.upper())
+        if not os.path.isdir(ticker_dir):
+            return
+        for name in os.listdir(ticker_dir):
+            if indicator is None or name.startswith(f"{indicator}_"):
+                path = os.path.join(ticker_dir, name)
+                os.remove(path)
+                candle_cache.invalidate(path)
+
+    def _extend(self, path, cached, meta, close) -> pd.DataFrame:
+        last_date = cached.index[-1]
+        new_close = close.loc[close.index > last_date]
+        revised = close.loc[last_date] != meta["last_close"]
+        if new_close.empty and not revised:
+            return cached
+
+        streaming = StreamingIndicator.from_state(meta["state"])
+        streaming.previous = meta["previous"]
+        rows = {}
+        if revised:
+            rows[last_date] = streaming.update(close.loc[last_date], replace=True)
+        for date, value in new_close.items():
+            rows[date] = streaming.update(value)
+        tail = self._frame(rows, streaming)
+        values = pd.concat([cached.loc[cached.index < tail.index[0]], tail])
+        if self.log:
+            logging.info(f"Extended {os.path.basename(path)} by {len(tail)} bars.")
+        return self._write(path, values, streaming, close)
+
+    def _compute(self, path, streaming, close) -> pd.DataFrame:
+        rows = {date: streaming.update(value) for date, value in close.items()}
+        if self.log:
+            logging.info(f"Computed {os.path.basename(path)} over {len(rows)} bars.")
+        return self._write(path, self._frame(rows, streaming), streaming, close)
+
+    def _write(self, path, values, streaming, close) -> pd.DataFrame:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        values.to_parquet(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        candle_cache.put(path, values)
+        meta = {
+            "last_date": values.index[-1].isoformat(),
+            "last_close": float(close.iloc[-1]),
+            "rows": len(values),
+            "state": streaming.state_dict(),
+            "previous": streaming.previous,
+        }
+        meta_path = self._meta_path(path)
+        with open(meta_path + ".tmp", "w") as file:
+            json.dump(meta, file)
+        os.replace(meta_path + ".tmp", meta_path)
+        return values
+
+    def _read_values(self, path: str) -> pd.DataFrame:
+        return candle_cache.get(path, lambda: self._load_values(path))
+
+    @staticmethod
+    def _load_values(path: str) -> pd.DataFrame:
+        try:
+            return pd.read_parquet(path)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    def _read_meta(self, path: str) -> dict:
+        try:
+            with open(self._meta_path(path)) as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _meta_path(path: str) -> str:
+        return path[: -len(".parquet")] + ".json"
+
+    def _streaming(self, indicator: str, params: dict) -> StreamingIndicator:
+        if indicator not in self.indicators:
+            raise ValueError(
+                f"Unknown indicator '{indicator}', expected one of {list(self.indicators)}"
+            )
+        return self.indicators[indicator](**params)
+
+    @staticmethod
+    def _closes(candles) -> pd.Series:
+        df = candles._get_candles()
+        if df.empty:
+            return pd.Series(dtype=float)
+        close = df["Close"].dropna()
+        if not isinstance(close.index, pd.DatetimeIndex):
+            close = close.set_axis(pd.to_datetime(close.index))
+        return close
+
+    @staticmethod
+    def _frame(rows: dict, streaming: StreamingIndicator) -> pd.DataFrame:
+        frame = pd.DataFrame.from_dict(rows, orient="index")
+        if list(frame.columns) == [0]:
+            frame.columns = [streaming.name]
+        frame.index.name = "Date"
+        return frame
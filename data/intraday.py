@@ -0,0 +1,180 @@
+import os
+import logging
+import pandas as pd
+import yfinance as yf
+import datetime as dt
+
+from data.candles import candle_cache
+
+
+class IntradayCandles:
+    """
+    Intraday bars stored as one compressed Parquet file per session day.
+
+    Files live under `{cache_dir}/intraday/{interval}/{TICKER}/{YYYY-MM-DD}.parquet`,
+    so a range read only opens the days it covers and closed days are never
+    rewritten. Each refresh re-downloads from the last cached day (which may
+    have been partial) in windows Yahoo accepts for the interval, and days
+    older than `retention_days` are deleted.
+    """
+
+    # Yahoo's lookback limit and max span per request, in days.
+    lookback_days = {"1m": 29, "60m": 729, "1h": 729}
+    request_days = {"1m": 7}
+    default_lookback = 59
+
+    def __init__(
+        self,
+        ticker: str,
+        cache_dir: str,
+        interval: str = "1m",
+        retention_days: int = 90,
+        stale_minutes: int = 15,
+        compression: str = "zstd",
+        log: bool = True,
+    ):
+        self.ticker = ticker.upper()
+        self.cache_dir = cache_dir
+        self.interval = interval
+        self.retention_days = retention_days
+        self.stale_minutes = stale_minutes
+        self.compression = compression
+        self.log = log
+        self.dir_path = os.path.join(cache_dir, "intraday", interval, self.ticker)
+
+    def get_candles(
+        self, start=None, end=None, columns: list = None, refresh: bool = True
+    ) -> pd.DataFrame:
+        if refresh and self.is_stale():
+            self.update()
+        days = self.days(start, end)
+        if not days:
+            return pd.DataFrame()
+        frames = [self._read_day(d) for d in days]
+        df = pd.concat(frames, axis=0)
+        if columns is not None:
+            df = df[columns]
+        return df
+
+    def days(self, start=None, end=None) -> list:
+        if not os.path.isdir(self.dir_path):
+            return []
+        start = None if start is None else pd.Timestamp(start).strftime("%Y-%m-%d")
+        end = None if end is None else pd.Timestamp(end).strftime("%Y-%m-%d")
+        days = sorted(
+            name[:-8] for name in os.listdir(self.dir_path) if name.endswith(".parquet")
+        )
+        return [
+            d
+            for d in days
+            if (start is None or d >= start) and (end is None or d <= end)
+        ]
+
+    def is_stale(self) -> bool:
+        # Holidays and pre-open hours look like a missing session below, so
+        # a refresh attempted within stale_minutes is never repeated.
+        if self._since_update() < pd.Timedelta(minutes=self.stale_minutes):
+            return False
+        days = self.days()
+        if not days:
+            return True
+        last = self._read_day(days[-1]).index[-1]
+        now = pd.Timestamp.now(tz=last.tz)
+        # A missing weekday session is always stale; the current session only
+        # once its last bar is older than stale_minutes.
+        last_session = pd.offsets.BDay().rollback(now.normalize())
+        if last.normalize() < last_session:
+            return True
+        if last.normalize() < now.normalize():
+            return False
+        return now - last > pd.Timedelta(minutes=self.stale_minutes)
+
+    def update(self) -> list:
+        """
+        Download bars since the last cached day and write them per day.
+
+        Returns:
+        --------
+        list : The session days that were written
+        """
+        today = dt.date.today()
+        lookback = self.lookback_days.get(self.interval, self.default_lookback)
+        earliest = today - dt.timedelta(days=min(lookback, self.retention_days))
+        days = self.days()
+        start = earliest
+        if days:
+            start = max(earliest, dt.date.fromisoformat(days[-1]))
+        step = dt.timedelta(days=self.request_days.get(self.interval, lookback))
+
+        frames = []
+        while start <= today:
+            end = min(start + step, today + dt.timedelta(days=1))
+            frames.append(self._fetch_candles(start, end))
+            start = end
+        frames = [f for f in frames if not f.empty]
+        written = []
+        if frames:
+            df = pd.concat(frames, axis=0)
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            for day, day_df in df.groupby(df.index.date, sort=True):
+                self._write_day(day.isoformat(), day_df)
+                written.append(day.isoformat())
+        self._mark_update()
+        self.prune()
+        return written
+
+    def prune(self):
+        cutoff = dt.date.today() - dt.timedelta(days=self.retention_days)
+        for day in self.days(end=cutoff - dt.timedelta(days=1)):
+            path = self._path(day)
+            os.remove(path)
+            candle_cache.invalidate(path)
+
+    def get_spot_price(self):
+        if self.is_stale():
+            self.update()
+        return self._read_day(self.days()[-1])["Close"].iloc[-1]
+
+    def _since_update(self) -> pd.Timedelta:
+        try:
+            updated = os.path.getmtime(os.path.join(self.dir_path, ".last_update"))
+        except FileNotFoundError:
+            return pd.Timedelta.max
+        return pd.Timedelta(seconds=dt.datetime.now().timestamp() - updated)
+
+    def _mark_update(self):
+        # The marker's mtime records the last attempt across processes.
+        os.makedirs(self.dir_path, exist_ok=True)
+        with open(os.path.join(self.dir_path, ".last_update"), "w"):
+            pass
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.dir_path, f"{day}.parquet")
+
+    def _read_day(self, day: str) -> pd.DataFrame:
+        path = self._path(day)
+        return candle_cache.get(path, lambda: pd.read_parquet(path))
+
+    def _write_day(self, day: str, df: pd.DataFrame):
+        os.makedirs(self.dir_path, exist_ok=True)
+        path = self._path(day)
+        df = df.copy()
+        df.index.name = "Datetime"
+        df.to_parquet(path + ".tmp", compression=self.compression)
+        os.replace(path + ".tmp", path)
+        candle_cache.put(path, df)
+
+    def _fetch_candles(self, start: dt.date, end: dt.date) -> pd.DataFrame:
+        if self.log:
+            logging.info(
+                f"Fetching {self.ticker} {self.interval} candles "
+                f"{start} to {end} from Yahoo Finance..."
+            )
+        return yf.download(
+            self.ticker,
+            start=start,
+            end=end,
+            interval=self.interval,
+            multi_level_index=False,
+            progress=False,
+        )
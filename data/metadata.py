@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import logging
+import threading
+import yfinance as yf
+
+from config.config import get_metadata_dir
+
+
+class TickerMetadata:
+    """
+    Process-wide cache of slow-changing ticker metadata.
+
+    Each field (info, expirations, dividend yield, earnings timestamp) has its
+    own TTL in seconds. Entries live in memory and, when `cache_dir` is set,
+    in one JSON file per ticker so new processes start warm. One `yf.Ticker`
+    per symbol is shared by every data class through `ticker()`.
+    """
+
+    default_ttls = {
+        "info": 6 * 3600,
+        "expirations": 3600,
+        "dividend_yield": 24 * 3600,
+        "earnings_timestamp": 6 * 3600,
+    }
+
+    def __init__(self, cache_dir: str = None, ttls: dict = None, log: bool = True):
+        self.cache_dir = cache_dir
+        self.ttls = {**self.default_ttls, **(ttls or {})}
+        self.log = log
+        self.entries = {}
+        self.tickers = {}
+        self.lock = threading.Lock()
+        self.ticker_locks = {}
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def ticker(self, symbol: str) -> yf.Ticker:
+        symbol = symbol.upper()
+        with self.lock:
+            if symbol not in self.tickers:
+                self.tickers[symbol] = yf.Ticker(symbol)
+            return self.tickers[symbol]
+
+    def get(self, symbol: str, field: str, yf_obj: yf.Ticker = None):
+        if field not in self.ttls:
+            raise ValueError(f"Unknown metadata field '{field}'")
+        symbol = symbol.upper()
+        # Per-ticker lock: concurrent callers for one symbol share a single
+        # fetch while other symbols proceed in parallel.
+        with self._ticker_lock(symbol):
+            entries = self._load(symbol)
+            if self._fresh(entries.get(field), field):
+                return entries[field]["value"]
+            value = self._fetch(symbol, field, yf_obj)
+            entries[field] = {"value": value, "timestamp": time.time()}
+            self._save(symbol)
+            return value
+
+    def info(self, symbol: str, yf_obj: yf.Ticker = None) -> dict:
+        return self.get(symbol, "info", yf_obj)
+
+    def expirations(self, symbol: str, yf_obj: yf.Ticker = None) -> list:
+        return self.get(symbol, "expirations", yf_obj)
+
+    def dividend_yield(self, symbol: str, yf_obj: yf.Ticker = None) -> float:
+        return self.get(symbol, "dividend_yield", yf_obj)
+
+    def earnings_timestamp(self, symbol: str, yf_obj: yf.Ticker = None) -> int:
+        return self.get(symbol, "earnings_timestamp", yf_obj)
+
+    def invalidate(self, symbol: str, field: str = None):
+        symbol = symbol.upper()
+        with self._ticker_lock(symbol):
+            entries = self._load(symbol)
+            if field is None:
+                entries.clear()
+            else:
+                entries.pop(field, None)
+            self._save(symbol)
+
+    def _fetch(self, symbol: str, field: str, yf_obj: yf.Ticker = None):
+        if yf_obj is None:
+            yf_obj = self.ticker(symbol)
+        if self.log:
+            logging.info(f"Fetching {symbol} {field} from Yahoo Finance...")
+        if field == "info":
+            return yf_obj.info
+        elif field == "expirations":
+            return list(yf_obj.options)
+        # Derived fields reuse the cached info instead of another request.
+        info = self._cached_info(symbol, yf_obj)
+        if field == "dividend_yield":
+            return info.get("dividendYield", 0)
+        elif field == "earnings_timestamp":
+            return info.get("earningsTimestamp", 0)
+
+    def _cached_info(self, symbol: str, yf_obj: yf.Ticker) -> dict:
+        entry = self.entries[symbol].get("info")
+        if self._fresh(entry, "info"):
+            return entry["value"]
+        info = self._fetch(symbol, "info", yf_obj)
+        self.entries[symbol]["info"] = {"value": info, "timestamp": time.time()}
+        return info
+
+    def _fresh(self, entry: dict, field: str) -> bool:
+        if entry is None:
+            return False
+        return time.time() - entry["timestamp"] < self.ttls[field]
+
+    def _ticker_lock(self, symbol: str) -> threading.Lock:
+        with self.lock:
+            return self.ticker_locks.setdefault(symbol, threading.Lock())
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}.json")
+
+    def _load(self, symbol: str) -> dict:
+        if symbol not in self.entries:
+            entries = {}
+            if self.cache_dir is not None:
+                try:
+                    with open(self._path(symbol)) as file:
+                        entries = json.load(file)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    entries = {}
+            self.entries[symbol] = entries
+        return self.entries[symbol]
+
+    def _save(self, symbol: str):
+        if self.cache_dir is None:
+            return
+        tmp_path = self._path(symbol) + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.entries[symbol], file, default=str)
+        os.replace(tmp_path, self._path(symbol))
+
+
+_metadata_store = None
+_metadata_lock = threading.Lock()
+
+
+def get_metadata_store(cache_dir: str = None) -> TickerMetadata:
+    # The store persists to the configured metadata dir unless the first
+    # caller passes its own; a later cache_dir only fills in a missing one.
+    global _metadata_store
+    with _metadata_lock:
+        if _metadata_store is None:
+            _metadata_store = TickerMetadata(cache_dir or _default_cache_dir())
+        elif cache_dir is not None and _metadata_store.cache_dir is None:
+            _metadata_store.cache_dir = cache_dir
+            os.makedirs(cache_dir, exist_ok=True)
+        return _metadata_store
+
+
+def _default_cache_dir():
+    try:
+        return get_metadata_dir()
+    except (OSError, KeyError, json.JSONDecodeError) as e:
+        logging.warning(f"No metadata dir configured, caching in memory only: {e}")
+        return None
@@ -3,6 +3,8 @@ import pandas as pd
 import yfinance as yf
 import datetime as dt
 
+from data.metadata import get_metadata_store
+
 
 class YahooNews:
     def __init__(self, ticker: str, cache_dir: str, yf_obj: yf.Ticker = None):
@@ -16,7 +18,7 @@ class YahooNews:
 
     def set_objects(self):
         if self.yf_obj is None:
-            self.yf_obj = yf.Ticker(self.ticker)
+            self.yf_obj = get_metadata_store().ticker(self.ticker)
         self.objects_set = True
 
     def get_news(self, export: bool = True):
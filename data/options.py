@@ -1,5 +1,5 @@
 import os
-import math
+import logging
 import numpy as np
 import pandas as pd
 import yfinance as yf
@@ -8,8 +8,107 @@ import yfinance as yf
 import datetime as dt
 
 from data.candles import Candles
+from data.snapshots import SnapshotStore
+from data.metadata import get_metadata_store
 from utils.utils import parse_expiration_date, calc_dte
-from utils.greeks import Greeks, OptionGreeksCalculator
+from utils.concurrency import map_concurrent
+from utils.greeks import (
+    Greeks,
+    OptionGreeksCalculator,
+    VectorizedGreeks,
+    BaroneAdesiWhaley,
+    BinomialLattice,
+    GreeksCache,
+    calculate_greeks_parallel,
+)
+
+
+def expected_moves(data: pd.DataFrame, spot, by: list = None) -> pd.DataFrame:
+    """
+    Straddle and IV implied moves for every expiration in one pass.
+
+    The ATM strike is the call closest to spot (first row on ties), the put
+    is taken at that same strike or, failing that, the put closest to spot.
+    Everything is found with stable sorts and group-bys instead of filtering
+    the chain once per expiration.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame
+        Option chain as built by `Options._fetch_options_data`
+    spot : float or dict or pd.Series
+        Spot price, or a mapping from the first `by` key (e.g. ticker) to spot
+    by : list
+        Extra grouping columns for multi-ticker frames, e.g. ["ticker"]
+
+    Returns:
+    --------
+    pd.DataFrame : One row per expiration (per `by` group), sorted by date
+    """
+    by = list(by or [])
+    keys = by + ["expiration_date"]
+    df = data.reset_index(drop=True)
+    if isinstance(spot, (dict, pd.Series)):
+        spot = df[by[0]].map(spot).values
+    df = df.assign(_spot=spot, _distance=(df["strike"] - spot).abs())
+
+    calls = df.loc[df["type"] == "call"]
+    puts = df.loc[df["type"] == "put"]
+    nearest = lambda side: (
+        side.sort_values("_distance", kind="mergesort")
+        .groupby(keys, sort=False)
+        .head(1)
+        .set_index(keys)
+    )
+    atm_calls = nearest(calls)
+    moves = pd.DataFrame(
+        {
+            "dte": df.groupby(keys, sort=False)["dte"].first(),
+            "spot": atm_calls["_spot"],
+            "atm_strike": atm_calls["strike"],
+            "call_mid": atm_calls["mid"],
+            "atm_iv": atm_calls["IV"],
+        }
+    ).loc[atm_calls.index]
+
+    # Put at the ATM call strike, falling back to the put closest to spot.
+    same_strike = (
+        puts.drop_duplicates(keys + ["strike"], keep="first")
+        .set_index(keys + ["strike"])["mid"]
+        .reindex(pd.MultiIndex.from_frame(moves.reset_index()[keys + ["atm_strike"]]))
+    )
+    fallback = nearest(puts)["mid"].reindex(moves.index)
+    put_mid = np.where(same_strike.notna().values, same_strike.values, fallback.values)
+
+    spot = moves["spot"]
+    straddle = moves["call_mid"] + put_mid
+    T = np.maximum(moves["dte"].astype(float), 0) / 365
+    predict_data = pd.DataFrame(
+        {
+            "dte": moves["dte"],
+            "straddle_cost": straddle,
+            "expected_move_pct": straddle / spot,
+        }
+    )
+    predict_data["expected_move_dollar"] = spot * predict_data["expected_move_pct"]
+    predict_data["atm_iv"] = moves["atm_iv"]
+    predict_data["iv_move"] = spot * moves["atm_iv"] * np.sqrt(T)
+    predict_data["spot"] = spot
+
+    expiration = pd.to_datetime(predict_data.index.get_level_values(-1))
+    if by:
+        predict_data.index = pd.MultiIndex.from_arrays(
+            [predict_data.index.get_level_values(k) for k in by] + [expiration],
+            names=keys,
+        )
+    else:
+        predict_data.index = expiration.rename(None)
+    predict_data.sort_index(inplace=True)
+    predict_data["upper"] = predict_data["spot"] + predict_data["expected_move_dollar"]
+    predict_data["lower"] = predict_data["spot"] - predict_data["expected_move_dollar"]
+    predict_data["upper_iv"] = predict_data["spot"] + predict_data["iv_move"]
+    predict_data["lower_iv"] = predict_data["spot"] - predict_data["iv_move"]
+    return predict_data
 
 
 class Options:
@@ -22,6 +121,18 @@ class Options:
         snapshot_date: str = "",
         FORCE_UPDATE: bool = False,
         yf_obj: yf.Ticker = None,
+        greeks_mode: str = "quantlib",
+        workers: int = 1,
+        min_parallel: int = 200,
+        solve_iv: bool = False,
+        greeks_cache: GreeksCache = None,
+        incremental: bool = False,
+        refresh_tolerance: float = 1e-6,
+        fetch_workers: int = 1,
+        rate_limit: float = None,
+        retries: int = 2,
+        storage: str = "csv",
+        risk_free_rate: float = None,
     ):
         self.ticker = ticker.upper()
         self.snapshot_dir = snapshot_dir
@@ -32,6 +143,37 @@ class Options:
         self.ticker_dir = os.path.join(self.snapshot_dir, self.ticker)
         self.greeks = Greeks()
         self.greeks_calc = OptionGreeksCalculator()
+        # "quantlib" prices row by row on a finite-difference grid, the other
+        # modes price the whole chain at once with an array engine.
+        self.greeks_mode = greeks_mode
+        self.greeks_engines = {
+            "vectorized": VectorizedGreeks(),
+            "baw": BaroneAdesiWhaley(),
+            "binomial": BinomialLattice(),
+        }
+        # Process count for the "quantlib" mode, small chains stay serial.
+        self.workers = workers
+        self.min_parallel = min_parallel
+        # Re-solve IV from mid prices instead of trusting Yahoo's column.
+        self.solve_iv = solve_iv
+        # Optional cache shared across refreshes (and instances) for "quantlib".
+        self.greeks_cache = greeks_cache
+        # With FORCE_UPDATE, only reprice contracts whose inputs moved since the
+        # last snapshot (relative tolerance on strike, IV, dte and spot).
+        self.incremental = incremental
+        self.refresh_tolerance = refresh_tolerance
+        # Expirations are fetched on a thread pool when fetch_workers > 1,
+        # rate_limit is in requests per second.
+        self.fetch_workers = fetch_workers
+        self.rate_limit = rate_limit
+        self.retries = retries
+        # "csv" keeps the per-day CSV files, "parquet" uses the columnar store.
+        if storage not in ("csv", "parquet"):
+            raise ValueError(f"storage must be 'csv' or 'parquet', got '{storage}'")
+        self.storage = storage
+        self.snapshot_store = SnapshotStore(self.snapshot_dir)
+        # A rate passed in (e.g. by a scanner) skips loading ^TNX candles.
+        self.risk_free_rate = risk_free_rate
         os.makedirs(self.ticker_dir, exist_ok=True)
         os.makedirs(self.candle_dir, exist_ok=True)
 
@@ -42,6 +184,7 @@ class Options:
         self.ticker_obj = None
         # Class data
         self.candles = pd.DataFrame()
+        self.data = pd.DataFrame()
         self.spot_price = np.nan
         self.objects_set = False
         self.candles_set = False
@@ -51,62 +194,118 @@ class Options:
 
     def _set_objects(self):
         self.candle_obj = Candles(self.ticker, self.candle_dir)
-        self.risk_free_obj = Candles("^TNX", self.candle_dir)
+        metadata = get_metadata_store()
         # Assign yf object if one is not provided to the class on initialization.
         if self.yf_obj is None:
-            self.yf_obj = yf.Ticker(self.ticker)
-        self.earnings_date = self.yf_obj.info.get("earningsTimestamp", 0)
+            self.yf_obj = metadata.ticker(self.ticker)
+        self.earnings_date = metadata.earnings_timestamp(self.ticker, self.yf_obj)
         self.earnings_date = dt.datetime.fromtimestamp(self.earnings_date)
         self.earnings_date_str = self.earnings_date.strftime("%Y-%m-%d")
-        self.expiration_dates = self.yf_obj.options
-        self.dividend_yield = self.yf_obj.info.get("dividendYield", 0)
+        self.expiration_dates = metadata.expirations(self.ticker, self.yf_obj)
+        self.dividend_yield = metadata.dividend_yield(self.ticker, self.yf_obj)
         self.candles = self.candle_obj.get_candles()
         self.spot_price = self.candles["Close"].iloc[-1]
-        self.risk_free_candles = self.risk_free_obj.get_candles()
-        self.risk_free_rate = self.risk_free_candles["Close"].iloc[-1] / 100
+        if self.risk_free_rate is None:
+            self.risk_free_obj = Candles("^TNX", self.candle_dir)
+            self.risk_free_candles = self.risk_free_obj.get_candles()
+            self.risk_free_rate = self.risk_free_candles["Close"].iloc[-1] / 100
 
         self.objects_set = True
 
-    def get_options_data(self):
+    def get_options_data(self, columns: list = None, expirations: list = None):
         if not self.objects_set:
             self._set_objects()
 
         if self.snapshot_date == "":
-            path = os.path.join(
-                self.ticker_dir,
-                self.snapshot_file.format(self.ticker, dt.datetime.now().date()),
-            )
+            path = self._snapshot_path(dt.datetime.now().date())
         else:
-            path = os.path.join(
-                self.ticker_dir,
-                self.snapshot_file.format(self.ticker, self.snapshot_date),
-            )
+            path = self._snapshot_path(self.snapshot_date)
         if self.FORCE_UPDATE:
             if self.snapshot_date == "":
-
-                data = self._fetch_options_data()
-                data.to_csv(path)
+                previous = None
+                if self.incremental:
+                    previous = self.data
+                    if previous.empty:
+                        previous = self._read_options_data(path)
+                data = self._fetch_options_data(previous)
+                data = self._write_options_data(data, path)
             else:  # Protects overwriting previous snapshot with current data.
                 pass
         else:
-            data = self._read_options_data(path)
-            if data.empty:
-                data = self._fetch_options_data()
-                data.to_csv(path)
-        return data
+            if os.path.exists(path):
+                data = self._read_options_data(path, columns, expirations)
+                if columns is None and expirations is None:
+                    self.data = data
+                return data
+            data = self._fetch_options_data()
+            data = self._write_options_data(data, path)
+        self.data = data
+        return self._select(data, columns, expirations)
+
+    def _snapshot_path(self, snapshot_date) -> str:
+        if self.storage == "parquet":
+            return self.snapshot_store.path(self.ticker, snapshot_date)
+        return os.path.join(
+            self.ticker_dir, self.snapshot_file.format(self.ticker, snapshot_date)
+        )
 
-    def _read_options_data(self, path: str):
+    def _read_options_data(
+        self, path: str, columns: list = None, expirations: list = None
+    ):
+        if self.storage == "parquet":
+            return self.snapshot_store.read_path(path, columns, expirations)
         try:
-            df = pd.read_csv(path)
-            return df
+            if columns is None:
+                df = pd.read_csv(path)
+            else:
+                needed = set(columns) | {"expiration_date"}
+                df = pd.read_csv(path, usecols=lambda c: c in needed)
+            return self._select(df, columns, expirations)
         except FileNotFoundError:
             df = pd.DataFrame()
             return df
 
-    def _fetch_options_data(self):
+    def _write_options_data(self, data: pd.DataFrame, path: str) -> pd.DataFrame:
+        if self.storage == "parquet":
+            return self.snapshot_store.write_path(data, path)
+        data.to_csv(path)
+        return data
+
+    def _select(
+        self, data: pd.DataFrame, columns: list = None, expirations: list = None
+    ) -> pd.DataFrame:
+        if expirations is not None:
+            expirations = pd.to_datetime(pd.Series(expirations))
+            data = data.loc[pd.to_datetime(data["expiration_date"]).isin(expirations)]
+        if columns is not None:
+            data = data[columns]
+        return data
+
+    def _fetch_options_data(self, previous: pd.DataFrame = None):
+        data = self._prepare_chain(self._fetch_raw_chain())
+        if previous is not None and not previous.empty:
+            return self._refresh_options_data(data, previous)
+        return self._price_chain(data)
+
+    def _price_chain(self, data: pd.DataFrame) -> pd.DataFrame:
+        # Calculate the greeks.
+        data = self._apply_greeks(data)
+        # Calculate the option risk
+        data = self.predict_option_risk(data)
+        data = data.apply(lambda row: self.apply_delta_risks(row), axis=1)
+
+        return data
+
+    def _fetch_raw_chain(self) -> pd.DataFrame:
         calls_list, puts_list = [], []
-        for exp in self.expiration_dates:
-            chain = self.yf_obj.option_chain(exp)
+        chains = map_concurrent(
+            self.yf_obj.option_chain,
+            self.expiration_dates,
+            workers=self.fetch_workers,
+            rate_limit=self.rate_limit,
+            retries=self.retries,
+        )
+        for chain in chains:
             calls = chain.calls
             puts = chain.puts
             calls["type"] = "call"
@@ -123,7 +322,10 @@ class Options:
         else:
             data_puts = pd.DataFrame()  # Handle case with no put options
         # Concatenate the combined calls and puts dataframes
-        data = pd.concat([data_calls, data_puts], axis=0, ignore_index=True)
+        return pd.concat([data_calls, data_puts], axis=0, ignore_index=True)
+
+    def _prepare_chain(self, data: pd.DataFrame) -> pd.DataFrame:
+        data["spot"] = self.spot_price
         data["strike_spread"] = (
             ((self.spot_price - data["strike"])) / data["strike"] * 100
         )
@@ -140,18 +342,124 @@ class Options:
         data.drop(columns=drop, inplace=True)
         # Calculate ratios
         data["vol/OI"] = data["volume"] / data["OI"]
+        if self.solve_iv:
+            data = self._solve_iv(data)
+        return data
 
-        # Calculate the greeks.
-        data = data.apply(lambda row: self.apply_american_option(row), axis=1)
-        # Calculate the option risk
-        data = self.predict_option_risk(data)
-        data = data.apply(lambda row: self.apply_delta_risks(row), axis=1)
+    def _refresh_options_data(
+        self, data: pd.DataFrame, previous: pd.DataFrame
+    ) -> pd.DataFrame:
+        greek_cols = ["bs_price", "delta", "gamma", "theta", "vega", "rho"]
+        delta_risk_cols = ["buyer_risk", "seller_risk"]
+        input_cols = ["strike", "IV", "dte", "spot"]
+        reused_cols = greek_cols + delta_risk_cols
+        if not set(input_cols + reused_cols + ["contractSymbol"]) <= set(
+            previous.columns
+        ):
+            # Older snapshots lack the inputs needed to diff against.
+            return self._price_chain(data)
+
+        old = (
+            previous.drop_duplicates("contractSymbol")
+            .set_index("contractSymbol")
+            .reindex(data["contractSymbol"])
+        )
+        unchanged = old["strike"].notna().to_numpy(copy=True)
+        for col in input_cols:
+            unchanged &= np.isclose(
+                data[col].values.astype(float),
+                old[col].values.astype(float),
+                rtol=self.refresh_tolerance,
+                atol=0.0,
+                equal_nan=True,
+            )
 
-        return data
+        reused = data.loc[unchanged].assign(
+            **{col: old.loc[unchanged, col].values for col in reused_cols}
+        )
+        changed = data.loc[~unchanged]
+        if not changed.empty:
+            changed = self._apply_greeks(changed)
+            changed = changed.apply(lambda row: self.apply_delta_risks(row), axis=1)
+        merged = pd.concat([reused, changed], axis=0).loc[data.index]
+        logging.info(
+            f"{self.ticker} refresh: reused {len(reused)}, repriced {len(changed)}."
+        )
+
+        # risk_score is normalized over the whole chain, so it is always
+        # recomputed (vectorized, negligible next to the greeks).
+        merged = self.predict_option_risk(merged)
+        cols = [c for c in merged.columns if c not in delta_risk_cols]
+        return merged[cols + delta_risk_cols]
 
     def _create_snapshot(self, df: pd.DataFrame, path: str):
         df.to_csv(path)
 
+    def _apply_greeks(self, data: pd.DataFrame) -> pd.DataFrame:
+        if self.greeks_mode == "quantlib":
+            compute = lambda contracts: calculate_greeks_parallel(
+                contracts,
+                workers=self.workers,
+                min_parallel=self.min_parallel,
+                calculator=self.greeks_calc,
+            )
+            if self.greeks_cache is not None:
+                greek_data = self.greeks_cache.calculate_many(
+                    self._contracts(data), compute
+                )
+            else:
+                greek_data = compute(self._contracts(data))
+            return data.assign(**pd.DataFrame(greek_data, index=data.index))
+        elif self.greeks_mode in self.greeks_engines:
+            engine = self.greeks_engines[self.greeks_mode]
+            greek_data = engine.calculate_greeks(
+                data["type"].values,
+                self.spot_price,
+                data["strike"].values,
+                float(self.risk_free_rate),
+                data["IV"].values,
+                self.dividend_yield,
+                data["dte"].values,
+            )
+            return data.assign(**greek_data)
+        else:
+            modes = ["quantlib"] + list(self.greeks_engines)
+            raise ValueError(
+                f"greeks_mode must be one of {modes}, got '{self.greeks_mode}'"
+            )
+
+    def _solve_iv(self, data: pd.DataFrame) -> pd.DataFrame:
+        # American quotes are inverted with BAW unless the chain is priced
+        # as European anyway.
+        if self.greeks_mode == "vectorized":
+            engine = self.greeks_engines["vectorized"]
+        else:
+            engine = self.greeks_engines["baw"]
+        iv = engine.implied_volatility(
+            data["type"].values,
+            data["mid"].values,
+            self.spot_price,
+            data["strike"].values,
+            float(self.risk_free_rate),
+            self.dividend_yield,
+            data["dte"].values,
+        )
+        data["yf_IV"] = data["IV"]
+        # Keep Yahoo's IV where the mid cannot be inverted.
+        data["IV"] = np.where(np.isnan(iv), data["IV"], iv)
+        return data
+
+    def _contracts(self, data: pd.DataFrame) -> list:
+        S = self.spot_price
+        r = float(self.risk_free_rate)
+        q = self.dividend_yield
+        return [
+            (option_type, S, float(K), r, float(sigma), q, int(dte))
+            for option_type, K, sigma, dte in zip(
+                data["type"], data["strike"], data["IV"], data["dte"]
+            )
+        ]
+
     def apply_american_option(self, row: pd.Series):
         S = self.spot_price
         K = float(row["strike"])
@@ -184,18 +492,8 @@ class Options:
         )  # .strftime(date_format)
         data = self.get_options_data()
         data = data.loc[data["expiration_date"] == exp]
-        # Parse
-        calls = data.loc[data["type"] == "call"]
-        puts = data.loc[data["type"] == "put"]
-
-        # Locate ATM strikes
-        atm_strike = calls.loc[
-            (calls["strike"] - self.spot_price).abs().idxmin(), "strike"
-        ]
-        # Calculate straddle.
-        calls_mid = calls.loc[calls["strike"] == atm_strike, "mid"].iloc[0]
-        puts_mid = puts.loc[puts["strike"] == atm_strike, "mid"].iloc[0]
-        straddle = calls_mid + puts_mid
+        # ATM straddle from the same machinery as the expiration moves.
+        straddle = expected_moves(data, self.spot_price)["straddle_cost"].iloc[0]
 
         expected_move_pct = straddle / self.spot_price
         expected_move = self.spot_price * expected_move_pct
@@ -211,59 +509,9 @@ class Options:
             self._set_objects()
 
         data = self.get_options_data()
-        predict_data = {}
-
-        for exp in self.expiration_dates:
-            df_slice = data.loc[data["expiration_date"] == exp, :]
-            calls = df_slice[df_slice["type"] == "call"]
-            puts = df_slice[df_slice["type"] == "put"]
-            # Locate ATM on the calls side (label-based)
-            call_idx = (calls["strike"] - self.spot_price).abs().idxmin()
-            atm_strike = calls.loc[call_idx, "strike"]
-            call_mid = calls.loc[call_idx, "mid"]
-            # Try to pull the put at the very same strike
-            put_rows = puts[puts["strike"] == atm_strike]
-            if not put_rows.empty:
-                put_mid = put_rows["mid"].iloc[0]
-            else:
-                # fallback: find the puts strike closest to spot (positional)
-                pos = np.abs(puts["strike"].values - self.spot_price).argmin()
-                put_atm = puts["strike"].iloc[pos]
-                put_mid = puts["mid"].iloc[pos]
-            straddle = call_mid + put_mid
-            dte = df_slice["dte"].iloc[0]
-            T = max(dte, 0) / 365
-            expected_move_pct = straddle / self.spot_price
-            expected_move_dollar = self.spot_price * expected_move_pct
-            # IV-based move: make sure to use that same atm_strike if it exists
-            try:
-                iv_atm = calls.loc[calls["strike"] == atm_strike, "IV"].iloc[0]
-            except IndexError:
-                # if calls didn’t really have that exact strike, pick nearest
-                pos = (calls["strike"].values - self.spot_price).abs().argmin()
-                iv_atm = calls["IV"].iloc[pos]
-            iv_move = self.spot_price * iv_atm * math.sqrt(T)
-            predict_data[exp] = {
-                "dte": dte,
-                "straddle_cost": straddle,
-                "expected_move_pct": expected_move_pct,
-                "expected_move_dollar": expected_move_dollar,
-                "atm_iv": iv_atm,
-                "iv_move": iv_move,
-            }
-        predict_data = pd.DataFrame.from_dict(predict_data, orient="index")
-        predict_data.index = pd.to_datetime(predict_data.index)
-        predict_data.sort_index(inplace=True)
-        predict_data["spot"] = self.spot_price
-        predict_data["upper"] = (
-            predict_data["spot"] + predict_data["expected_move_dollar"]
-        )
-        predict_data["lower"] = (
-            predict_data["spot"] - predict_data["expected_move_dollar"]
-        )
-        predict_data["upper_iv"] = predict_data["spot"] + predict_data["iv_move"]
-        predict_data["lower_iv"] = predict_data["spot"] - predict_data["iv_move"]
-        return predict_data
+        expirations = pd.to_datetime(pd.Series(self.expiration_dates))
+        data = data.loc[pd.to_datetime(data["expiration_date"]).isin(expirations)]
+        return expected_moves(data, self.spot_price)
 
     def predict_option_risk(self, df: pd.DataFrame) -> pd.DataFrame:
 
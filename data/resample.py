@@ -0,0 +1,147 @@
+import threading
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+
+OHLCV_AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+
+def resample_candles(
+    df: pd.DataFrame,
+    rule: str,
+    closed: str = None,
+    label: str = None,
+    origin="start_day",
+    aggregations: dict = None,
+) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into a coarser timeframe.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Bars on a DatetimeIndex (date strings are parsed)
+    rule : str
+        Pandas offset alias, e.g. "W-FRI", "ME", "5min", "1h"
+    closed, label, origin :
+        Passed to `DataFrame.resample`
+    aggregations : dict
+        Column -> aggregation overrides, unknown columns take the last value
+
+    Returns:
+    --------
+    pd.DataFrame : One row per non-empty bucket
+    """
+    if df.empty:
+        return df
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df = df.set_axis(pd.to_datetime(df.index), axis=0)
+    aggregations = {**OHLCV_AGGREGATIONS, **(aggregations or {})}
+    aggregations = {c: aggregations.get(c, "last") for c in df.columns}
+    # Anchored offsets (weeks, months) ignore the origin.
+    kwargs = {"origin": origin} if isinstance(to_offset(rule), Tick) else {}
+    out = df.resample(rule, closed=closed, label=label, **kwargs).agg(aggregations)
+    # Buckets without a base bar (weekends, overnight) come back empty.
+    price_columns = [c for c in ["Open", "High", "Low", "Close"] if c in out]
+    return out.dropna(subset=price_columns or None, how="all")
+
+
+class CandleResampler:
+    """
+    Resampled views of `Candles` caches, kept in memory and updated in place.
+
+    Results are keyed by the candle cache and resample arguments. When the
+    base bars only grew since the last call, or the last cached bar was
+    revised (incremental refreshes re-request it), just the last bucket
+    onwards is re-aggregated; any other change triggers a full recompute.
+    Bucket edges are anchored to the first base bar's day, so tail and full
+    computations line up.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def resample(
+        self, candles, rule: str, closed: str = None, label: str = None
+    ) -> pd.DataFrame:
+        base = candles._get_candles()
+        if base.empty:
+            return base
+        if not isinstance(base.index, pd.DatetimeIndex):
+            base = base.set_axis(pd.to_datetime(base.index), axis=0)
+        key = (
+            candles.file_path,
+            candles.interval,
+            candles.incremental,
+            rule,
+            closed,
+            label,
+        )
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and self._extends(entry, base):
+            revised = not entry["base_row"].equals(base.iloc[entry["base_len"] - 1])
+            if len(base) == entry["base_len"] and not revised:
+                return entry["result"]
+            previous = entry["result"]
+            entry = self._aggregate(base, entry["tail_start"], entry["origin"], key)
+            tail = entry["result"]
+            entry["result"] = pd.concat(
+                [previous.loc[previous.index < tail.index[0]], tail]
+            )
+        else:
+            origin = base.index[0].normalize()
+            entry = self._aggregate(base, 0, origin, key)
+        with self.lock:
+            self.entries[key] = entry
+        return entry["result"]
+
+    def invalidate(self, candles=None):
+        with self.lock:
+            if candles is None:
+                self.entries.clear()
+                return
+            for key in [k for k in self.entries if k[0] == candles.file_path]:
+                del self.entries[key]
+
+    @staticmethod
+    def _extends(entry: dict, base: pd.DataFrame) -> bool:
+        n = entry["base_len"]
+        return len(base) >= n and base.index[n - 1] == entry["base_last"]
+
+    @staticmethod
+    def _aggregate(base, start: int, origin, key) -> dict:
+        rule, closed, label = key[3:]
+        tail = base.iloc[start:].assign(_position=np.arange(start, len(base)))
+        result = resample_candles(
+            tail,
+            rule,
+            closed=closed,
+            label=label,
+            origin=origin,
+            aggregations={"_position": "first"},
+        )
+        # Position of the first base bar in the last bucket, where the next
+        # incremental update starts.
+        tail_start = int(result["_position"].iloc[-1])
+        return {
+            "result": result.drop(columns="_position"),
+            "origin": origin,
+            "tail_start": tail_start,
+            "base_len": len(base),
+            "base_last": base.index[-1],
+            "base_row": base.iloc[-1].copy(),
+        }
+
+
+candle_resampler = CandleResampler()
@@ -0,0 +1,101 @@
+import time
+import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from data.candles import Candles
+from data.options import Options, expected_moves
+
+
+class OptionsScanner:
+    """
+    Runs the `Options` pipeline over a ticker universe.
+
+    Market context shared by every ticker (the ^TNX risk-free rate) is loaded
+    once, chains are processed on a bounded thread pool, and a failing ticker
+    is logged and recorded in `errors` without stopping the scan. Extra
+    keyword arguments are passed to every `Options` instance.
+    """
+
+    def __init__(
+        self,
+        tickers: list,
+        snapshot_dir: str,
+        candle_dir: str,
+        workers: int = 8,
+        risk_free_rate: float = None,
+        log: bool = True,
+        **options_kwargs,
+    ):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.snapshot_dir = snapshot_dir
+        self.candle_dir = candle_dir
+        self.workers = workers
+        self.risk_free_rate = risk_free_rate
+        self.log = log
+        self.options_kwargs = options_kwargs
+
+        self.data = pd.DataFrame()
+        self.spot_prices = {}
+        self.errors = {}
+        self.timings = {}
+
+    def _set_market_context(self):
+        if self.risk_free_rate is None:
+            risk_free_candles = Candles("^TNX", self.candle_dir).get_candles()
+            self.risk_free_rate = risk_free_candles["Close"].iloc[-1] / 100
+
+    def scan(self) -> pd.DataFrame:
+        self._set_market_context()
+        self.errors, self.timings = {}, {}
+        results = {}
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._scan_ticker, t): t for t in self.tickers}
+            for done, future in enumerate(as_completed(futures), start=1):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                    status = "ok"
+                except Exception as e:
+                    self.errors[ticker] = e
+                    status = f"failed ({e!r})"
+                if self.log:
+                    logging.info(
+                        f"[{done}/{len(self.tickers)}] {ticker} {status} "
+                        f"in {self.timings.get(ticker, 0):.2f}s"
+                    )
+        if self.log:
+            logging.info(
+                f"Scanned {len(results)}/{len(self.tickers)} tickers "
+                f"in {time.time() - start:.2f}s, {len(self.errors)} failed."
+            )
+
+        frames = [results[t] for t in self.tickers if t in results]
+        if frames:
+            self.data = pd.concat(frames, axis=0, ignore_index=True)
+        else:
+            self.data = pd.DataFrame()
+        return self.data
+
+    def _scan_ticker(self, ticker: str) -> pd.DataFrame:
+        start = time.time()
+        try:
+            options = Options(
+                ticker,
+                self.snapshot_dir,
+                self.candle_dir,
+                risk_free_rate=self.risk_free_rate,
+                **self.options_kwargs,
+            )
+            data = options.get_options_data()
+            self.spot_prices[ticker] = options.spot_price
+        finally:
+            self.timings[ticker] = time.time() - start
+        data.insert(0, "ticker", ticker)
+        return data
+
+    def expected_moves(self) -> pd.DataFrame:
+        if self.data.empty:
+            self.scan()
+        return expected_moves(self.data, self.spot_prices, by=["ticker"])
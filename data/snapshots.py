@@ -0,0 +1,253 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+
+class SnapshotStore:
+    """
+    Columnar option snapshots, one Parquet file per ticker and day.
+
+    Files live under `{snapshot_dir}/{TICKER}/snapshot_date={YYYY-MM-DD}/`
+    so the directory can also be scanned as a hive-partitioned dataset.
+    Rows are written sorted with one row group per expiration, which lets
+    expiration filters skip whole row groups on read.
+    """
+
+    file_name = "part-0.parquet"
+    date_columns = ["expiration_date"]
+    bool_columns = ["ITM"]
+
+    def __init__(self, snapshot_dir: str, compression: str = "zstd"):
+        self.snapshot_dir = snapshot_dir
+        self.compression = compression
+
+    def path(self, ticker: str, snapshot_date) -> str:
+        snapshot_date = pd.Timestamp(snapshot_date).strftime("%Y-%m-%d")
+        return os.path.join(
+            self.snapshot_dir,
+            ticker.upper(),
+            f"snapshot_date={snapshot_date}",
+            self.file_name,
+        )
+
+    def dates(self, ticker: str) -> list:
+        ticker_dir = os.path.join(self.snapshot_dir, ticker.upper())
+        if not os.path.isdir(ticker_dir):
+            return []
+        dates = [
+            d.split("=", 1)[1]
+            for d in os.listdir(ticker_dir)
+            if d.startswith("snapshot_date=")
+            and os.path.exists(os.path.join(ticker_dir, d, self.file_name))
+        ]
+        return sorted(dates)
+
+    def write(self, df: pd.DataFrame, ticker: str, snapshot_date) -> pd.DataFrame:
+        return self.write_path(df, self.path(ticker, snapshot_date))
+
+    def read(
+        self,
+        ticker: str,
+        snapshot_date,
+        columns: list = None,
+        expirations: list = None,
+    ) -> pd.DataFrame:
+        return self.read_path(
+            self.path(ticker, snapshot_date), columns=columns, expirations=expirations
+        )
+
+    def write_path(self, df: pd.DataFrame, path: str) -> pd.DataFrame:
+        df = self.normalize(df)
+        sort_cols = [c for c in ["expiration_date", "type", "strike"] if c in df]
+        if sort_cols:
+            df = df.sort_values(sort_cols, kind="mergesort", ignore_index=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with pq.ParquetWriter(
+            tmp_path, table.schema, compression=self.compression
+        ) as writer:
+            if "expiration_date" in df and not df.empty:
+                # One row group per expiration keeps predicate pushdown cheap.
+                bounds = df["expiration_date"].ne(df["expiration_date"].shift())
+                starts = list(bounds[bounds].index) + [len(df)]
+                for start, end in zip(starts[:-1], starts[1:]):
+                    writer.write_table(table.slice(start, end - start))
+            else:
+                writer.write_table(table)
+        # Replace atomically so readers never see a half-written snapshot.
+        os.replace(tmp_path, path)
+        return df
+
+    def read_path(
+        self, path: str, columns: list = None, expirations: list = None
+    ) -> pd.DataFrame:
+        filters = None
+        if expirations is not None:
+            expirations = [pd.Timestamp(e).to_datetime64() for e in expirations]
+            filters = [("expiration_date", "in", expirations)]
+        try:
+            table = pq.read_table(path, columns=columns, filters=filters)
+        except FileNotFoundError:
+            return pd.DataFrame()
+        return table.to_pandas()
+
+    def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop(columns=["Unnamed: 0"], errors="ignore").copy()
+        for col in self.date_columns:
+            if col in df:
+                df[col] = pd.to_datetime(df[col]).astype("datetime64[ms]")
+        if "lastTradeDate" in df:
+            df["lastTradeDate"] = pd.to_datetime(df["lastTradeDate"], utc=True)
+        # Booleans that went through a CSV come back as strings.
+        bools = {"True": True, "False": False, True: True, False: False}
+        for col in self.bool_columns:
+            if col in df and df[col].dtype == object:
+                df[col] = df[col].map(bools).astype("boolean")
+        return df
+
+
+class SnapshotHistory:
+    """
+    Multi-day view over a ticker's option snapshots.
+
+    Days are pruned by file name before anything is opened, Parquet days are
+    scanned through a memory-mapped pyarrow dataset that only materializes
+    the requested columns and rows, and legacy CSV days are read with
+    `usecols`. The result is a tidy panel indexed by
+    (snapshot_date, expiration_date, strike, type).
+    """
+
+    index_columns = ["snapshot_date", "expiration_date", "strike", "type"]
+
+    def __init__(self, snapshot_dir: str, memory_map: bool = True):
+        self.snapshot_dir = snapshot_dir
+        self.store = SnapshotStore(snapshot_dir)
+        self.filesystem = fs.LocalFileSystem(use_mmap=memory_map)
+        self.partitioning = ds.partitioning(
+            pa.schema([("snapshot_date", pa.string())]), flavor="hive"
+        )
+
+    def dates(self, ticker: str, start: str = None, end: str = None) -> dict:
+        # snapshot date -> storage format, Parquet wins when both exist.
+        ticker = ticker.upper()
+        ticker_dir = os.path.join(self.snapshot_dir, ticker)
+        found = {}
+        if os.path.isdir(ticker_dir):
+            for name in os.listdir(ticker_dir):
+                if name.startswith(f"{ticker}_") and name.endswith(".csv"):
+                    found[name[len(ticker) + 1 : -4]] = "csv"
+        for d in self.store.dates(ticker):
+            found[d] = "parquet"
+        return {
+            d: found[d]
+            for d in sorted(found)
+            if (start is None or d >= str(start)) and (end is None or d <= str(end))
+        }
+
+    def load(
+        self,
+        ticker: str,
+        columns: list = None,
+        start: str = None,
+        end: str = None,
+        expirations: list = None,
+        types: list = None,
+    ) -> pd.DataFrame:
+        dates = self.dates(ticker, start, end)
+        frames = []
+        parquet_dates = [d for d, kind in dates.items() if kind == "parquet"]
+        if parquet_dates:
+            frames.append(
+                self._scan_parquet(ticker, parquet_dates, columns, expirations, types)
+            )
+        for d in (d for d, kind in dates.items() if kind == "csv"):
+            frames.append(self._read_csv(ticker, d, columns, expirations, types))
+        if not frames:
+            return pd.DataFrame()
+        panel = pd.concat(frames, axis=0, ignore_index=True)
+        return panel.set_index(self.index_columns).sort_index()
+
+    def iter_days(
+        self, ticker: str, columns: list = None, start=None, end=None, **kwargs
+    ):
+        # One day in memory at a time for streaming analytics.
+        for d in self.dates(ticker, start, end):
+            yield d, self.load(ticker, columns, start=d, end=d, **kwargs)
+
+    def atm_iv(self, ticker: str, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        ATM call IV per (snapshot_date, expiration_date).
+
+        The ATM strike is the call closest to spot. Older snapshots without
+        a spot column get the distance back from `strike_spread`, which is
+        relative to the strike.
+        """
+        panel = self.load(
+            ticker, ["IV", "dte", "spot", "strike_spread"], start, end, types=["call"]
+        ).reset_index()
+        distance = panel["strike"] * panel["strike_spread"] / 100
+        if "spot" in panel:
+            distance = (panel["strike"] - panel["spot"]).fillna(distance)
+        panel = panel.assign(distance=distance.abs())
+        panel = panel.sort_values(
+            ["snapshot_date", "expiration_date", "distance"], kind="mergesort"
+        )
+        atm = panel.groupby(["snapshot_date", "expiration_date"], sort=True).first()
+        return atm[["strike", "IV", "dte"]].rename(columns={"IV": "atm_iv"})
+
+    def _scan_parquet(self, ticker, dates, columns, expirations, types):
+        ticker_dir = os.path.join(self.snapshot_dir, ticker.upper())
+        paths = [self.store.path(ticker, d) for d in dates]
+        dataset = ds.dataset(
+            paths,
+            format="parquet",
+            filesystem=self.filesystem,
+            partitioning=self.partitioning,
+            partition_base_dir=ticker_dir,
+        )
+        expression = None
+        if expirations is not None:
+            expirations = pa.array(
+                [pd.Timestamp(e) for e in expirations], pa.timestamp("ms")
+            )
+            expression = ds.field("expiration_date").isin(expirations)
+        if types is not None:
+            type_filter = ds.field("type").isin(types)
+            expression = (
+                type_filter if expression is None else expression & type_filter
+            )
+        table = dataset.to_table(
+            columns=self._columns(columns, dataset.schema.names), filter=expression
+        )
+        df = table.to_pandas()
+        df["snapshot_date"] = pd.to_datetime(df["snapshot_date"])
+        return df
+
+    def _read_csv(self, ticker, snapshot_date, columns, expirations, types):
+        path = os.path.join(
+            self.snapshot_dir, ticker.upper(), f"{ticker.upper()}_{snapshot_date}.csv"
+        )
+        needed = None
+        if columns is not None:
+            needed = set(columns) | set(self.index_columns)
+        usecols = None if needed is None else lambda c: c in needed
+        df = pd.read_csv(path, usecols=usecols)
+        df = df.drop(columns=["Unnamed: 0"], errors="ignore")
+        df["expiration_date"] = pd.to_datetime(df["expiration_date"])
+        if expirations is not None:
+            df = df.loc[df["expiration_date"].isin(pd.to_datetime(expirations))]
+        if types is not None:
+            df = df.loc[df["type"].isin(types)]
+        df["snapshot_date"] = pd.Timestamp(snapshot_date)
+        return df
+
+    def _columns(self, columns, available):
+        if columns is None:
+            return None
+        wanted = list(dict.fromkeys(list(columns) + self.index_columns))
+        return [c for c in wanted if c in available]
@@ -6,8 +6,9 @@ import datetime as dt
 
 
 from utils.dates import is_stale
-from utils.utils import handle_growth
+from utils.utils import handle_growth, aggregate_periods
 from data.candles import Candles
+from data.metadata import get_metadata_store
 
 
 class FinancialStatements:
@@ -19,6 +20,7 @@ class FinancialStatements:
         self.candle_dir = candle_dir
         self.yf_obj = yf_obj
         self.objects_set = False
+        self.candles_set = False
 
         # Path creation
         self.ticker_dir = os.path.join(self.cache_dir, self.ticker)
@@ -33,17 +35,21 @@ class FinancialStatements:
 
         self.statements = {}
 
-    def set_objects(self):
+    def set_objects(self, candles: bool = True):
         if self.yf_obj is None:
-            self.yf_obj = yf.Ticker(self.ticker)
+            self.yf_obj = get_metadata_store().ticker(self.ticker)
 
-        self.candle_obj = Candles(self.ticker, self.candle_dir)
-        self.candles = self.candle_obj.get_candles()
+        if candles:
+            self.candle_obj = Candles(self.ticker, self.candle_dir)
+            self.candles = self.candle_obj.get_candles()
+            self.candles_set = True
         self.objects_set = True
 
-    def set_statements(self, annual: bool = True):
+    def set_statements(self, annual: bool = True, candle_rows: bool = True):
+        # candle_rows=False skips the price download behind the high, low
+        # and average rows.
         if not self.objects_set:
-            self.set_objects()
+            self.set_objects(candle_rows)
 
         if annual:
             period = "annual"
@@ -72,13 +78,14 @@ class FinancialStatements:
                     df = pd.concat([df, unique_data], axis=1)
                     df.to_csv(path)
 
-            candle_data = self.create_candle_rows(df.columns.to_list())
-            df = pd.concat([df, candle_data], axis=0)
+            if candle_rows:
+                candle_data = self.create_candle_rows(df.columns.to_list())
+                df = pd.concat([df, candle_data], axis=0)
             self.statements[k] = df
 
-    def get_statements(self, annual: bool = True):
+    def get_statements(self, annual: bool = True, candle_rows: bool = True):
         if self.statements == {}:
-            self.set_statements(annual)
+            self.set_statements(annual, candle_rows)
         return self.statements
 
     def _read_file(self, path: str):
@@ -112,34 +119,11 @@ class FinancialStatements:
         data = data.iloc[:, ::-1]
         return data
 
-    def create_candle_rows(self, dates: list):
-        if not self.objects_set:
+    def create_candle_rows(self, dates: list, aggregates=("high", "low", "average")):
+        # Price stats between consecutive statement dates, see aggregate_periods.
+        if not self.candles_set:
             self.set_objects()
-        index = 0
-        high, low, average = [], [], []
-        print(f"Candles: {self.candles}")
-        for d in dates:
-            if index == 0:
-                _high = np.nan
-                _low = np.nan
-                _average = np.nan
-            else:
-                prev_date = dates[index - 1]
-                candle_slice = self.candles.loc[prev_date:d]
-                _high = candle_slice["High"].max()
-                _low = candle_slice["Low"].min()
-                _average = candle_slice["Close"].mean()
-
-            print(f"High: {_high}")
-            high.append(_high)
-            low.append(_low)
-            average.append(_average)
-            index += 1
-
-        df_data = {"high": high, "low": low, "average": average}
-
-        df = pd.DataFrame(df_data, index=dates)  # ["high", "low", "average"])
-        return df.T
+        return aggregate_periods(self.candles, dates, aggregates).T
 
     def get_ratios(self, annual: bool = True):
         if self.statements == {}:
@@ -0,0 +1,80 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    def __init__(self, rate: float = None):
+        # rate is in calls per second, None disables limiting.
+        self.interval = 1 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_call = 0.0
+
+    def wait(self):
+        if self.interval == 0.0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def call_with_retry(
+    func,
+    *args,
+    retries: int = 2,
+    backoff: float = 0.5,
+    exceptions: tuple = (Exception,),
+    **kwargs,
+):
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2**attempt
+            logging.warning(f"{e!r}, retrying in {delay:.2f}s...")
+            time.sleep(delay)
+
+
+def map_concurrent(
+    func,
+    items,
+    workers: int = 8,
+    rate_limit: float = None,
+    retries: int = 2,
+    backoff: float = 0.5,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Apply `func` to every item on a bounded thread pool.
+
+    Every attempt waits on a shared rate limiter and failures are retried with
+    exponential backoff. Results come back in the order of `items`. With
+    `return_exceptions`, an item that still fails gets its exception in place
+    of a result so it can't abort the rest of the batch.
+    """
+    items = list(items)
+    limiter = RateLimiter(rate_limit)
+
+    def limited(item):
+        limiter.wait()
+        return func(item)
+
+    def task(item):
+        try:
+            return call_with_retry(limited, item, retries=retries, backoff=backoff)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            logging.exception(e)
+            return e
+
+    if workers <= 1 or len(items) <= 1:
+        return [task(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(task, items))
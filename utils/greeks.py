@@ -1,7 +1,10 @@
+import os
 import math
 import pandas as pd
 import numpy as np
 from scipy.stats import norm
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import QuantLib as ql
 
@@ -96,49 +99,140 @@ class Greeks:
         }
 
     def binomial_american_greeks(self, S0, K, r, q, sigma, T, option_type="put", N=200):
-        dt = T / N
-        print(f"DF: {dt}")
-        print(f"Type: {type(dt)}")
-        u = math.exp(sigma * math.sqrt(dt))
-        d = 1 / u
-        disc = math.exp(-r * dt)
-        p = (math.exp((r - q) * dt) - d) / (u - d)
-
-        # terminal payoffs
-        ST = np.array([S0 * u**j * d ** (N - j) for j in range(N + 1)])
-        if option_type == "call":
-            vals = np.maximum(ST - K, 0.0)
-        else:
-            vals = np.maximum(K - ST, 0.0)
+        # Price, delta and theta all come from one tree instead of re-pricing
+        # recursively with N-1 steps for theta.
+        lattice = BinomialLattice(steps=N, round_output=False)
+        price, delta, _, theta = lattice.price_tree(
+            lattice._is_call(option_type), S0, K, r, sigma, q, T
+        )
+        return price[0], delta[0], theta[0]
 
-        # back-induction
-        for i in range(N - 1, -1, -1):
-            ST = ST[: i + 1] / u  # move stock prices one step backwards
-            cont = disc * (p * vals[1:] + (1 - p) * vals[:-1])
-            if option_type == "call":
-                exercise = np.maximum(ST - K, 0.0)
-            else:
-                exercise = np.maximum(K - ST, 0.0)
-            vals = np.maximum(cont, exercise)
 
-            # capture Δ at first step
-            if i == 1:
-                V_up, V_down = vals[1], vals[0]
-                delta = (V_up - V_down) / (S0 * (u - d))
+class QuantLibPricingContext:
+    """
+    QuantLib market objects shared by every contract of a chain.
 
-        price = vals[0]
+    Quotes, flat curves, the Black-Scholes-Merton process and the
+    finite-difference engine are built once. Contracts are repriced by
+    updating the volatility quote, and refreshes only move the spot, rate and
+    dividend quotes.
+    """
 
-        # Theta: re-price with T-dt and N-1 steps, holding S0 constant
-        price_short, _, _ = (
-            self.binomial_american_greeks(
-                S0, K, r, q, sigma, T - dt, option_type, N - 1
-            )
-            if N > 1
-            else (price, None, None)
+    def __init__(
+        self,
+        underlying_price: float,
+        risk_free_rate: float,
+        dividend_yield: float,
+        calculation_date: ql.Date = None,
+        day_count: ql.DayCounter = None,
+        calendar: ql.Calendar = None,
+        time_steps: int = 200,
+        grid_points: int = 200,
+    ):
+        if calculation_date is None:
+            calculation_date = ql.Date.todaysDate()
+        if day_count is None:
+            day_count = ql.Actual365Fixed()
+        if calendar is None:
+            calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
+        self.calculation_date = calculation_date
+        ql.Settings.instance().evaluationDate = self.calculation_date
+
+        # Market data
+        self.spot = ql.SimpleQuote(underlying_price)
+        self.rf_rate = ql.SimpleQuote(risk_free_rate)
+        self.div_rate = ql.SimpleQuote(dividend_yield)
+        self.vol = ql.SimpleQuote(0.2)
+
+        risk_free_curve = ql.FlatForward(
+            calculation_date, ql.QuoteHandle(self.rf_rate), day_count
+        )
+        dividend_curve = ql.FlatForward(
+            calculation_date, ql.QuoteHandle(self.div_rate), day_count
+        )
+        volatility_curve = ql.BlackConstantVol(
+            calculation_date, calendar, ql.QuoteHandle(self.vol), day_count
+        )
+        self.process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(self.spot),
+            ql.YieldTermStructureHandle(dividend_curve),
+            ql.YieldTermStructureHandle(risk_free_curve),
+            ql.BlackVolTermStructureHandle(volatility_curve),
+        )
+        self.engine = ql.FdBlackScholesVanillaEngine(
+            self.process, time_steps, grid_points
+        )
+
+    def update(
+        self,
+        underlying_price: float = None,
+        risk_free_rate: float = None,
+        dividend_yield: float = None,
+    ):
+        for quote, value in (
+            (self.spot, underlying_price),
+            (self.rf_rate, risk_free_rate),
+            (self.div_rate, dividend_yield),
+        ):
+            if value is not None and quote.value() != value:
+                quote.setValue(value)
+
+    def calculate_greeks(
+        self,
+        option_type="call",
+        strike_price=100.0,
+        volatility=0.2,
+        days_to_expiration=30,
+    ):
+        calculation_date = self.calculation_date
+        ql.Settings.instance().evaluationDate = calculation_date
+        expiration_date = calculation_date + int(days_to_expiration)
+
+        # Option payoff
+        option_type_ql = (
+            ql.Option.Call if option_type.lower() == "call" else ql.Option.Put
         )
-        theta = (price_short - price) / dt
+        payoff = ql.PlainVanillaPayoff(option_type_ql, strike_price)
+        exercise = ql.AmericanExercise(calculation_date, expiration_date)
+        option = ql.VanillaOption(payoff, exercise)
+        option.setPricingEngine(self.engine)
+        self.vol.setValue(volatility)
+
+        # Calculate price and available Greeks
+        price = option.NPV()
+        delta = option.delta()
+        gamma = option.gamma()
+
+        try:
+            theta = option.theta() / 365.0  # Daily theta
+        except:
+            # Calculate theta using finite difference if method not available
+            h = 1.0 / 365.0  # One day
+            ql.Settings.instance().evaluationDate = calculation_date + 1
+            theta = (option.NPV() - price) / h
+            ql.Settings.instance().evaluationDate = calculation_date
 
-        return price, delta, theta
+        # Bumping the shared quotes reprices the same option object.
+        vol_bump = 0.01  # 1% volatility bump
+        self.vol.setValue(volatility + vol_bump)
+        vega = (option.NPV() - price) / vol_bump
+        self.vol.setValue(volatility)
+
+        rate_bump = 0.01  # 1% rate bump
+        risk_free_rate = self.rf_rate.value()
+        self.rf_rate.setValue(risk_free_rate + rate_bump)
+        rho = (option.NPV() - price) / rate_bump
+        self.rf_rate.setValue(risk_free_rate)
+
+        # Return the results
+        return {
+            "bs_price": round(price, 2),
+            "delta": round(delta, 4),
+            "gamma": round(gamma, 4),
+            "theta": round(theta, 4),
+            "vega": round(vega, 4),
+            "rho": round(rho, 4),
+        }
 
 
 class OptionGreeksCalculator:
@@ -146,6 +240,26 @@ class OptionGreeksCalculator:
         self.day_count = ql.Actual365Fixed()
         self.calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
         self.business_convention = ql.Following
+        self.context = None
+
+    def get_context(
+        self, underlying_price: float, risk_free_rate: float, dividend_yield: float
+    ) -> QuantLibPricingContext:
+        # The context is rebuilt only when the evaluation date rolls over,
+        # otherwise its quotes are moved to the new market data.
+        today = ql.Date.todaysDate()
+        if self.context is None or self.context.calculation_date != today:
+            self.context = QuantLibPricingContext(
+                underlying_price,
+                risk_free_rate,
+                dividend_yield,
+                calculation_date=today,
+                day_count=self.day_count,
+                calendar=self.calendar,
+            )
+        else:
+            self.context.update(underlying_price, risk_free_rate, dividend_yield)
+        return self.context
 
     def calculate_greeks(
         self,
@@ -181,91 +295,841 @@ class OptionGreeksCalculator:
         --------
         dict : Dictionary containing option Greeks and price
         """
-        # Set up dates
-        calculation_date = ql.Date.todaysDate()
-        ql.Settings.instance().evaluationDate = calculation_date
-        expiration_date = calculation_date + days_to_expiration
+        context = self.get_context(underlying_price, risk_free_rate, dividend_yield)
+        return context.calculate_greeks(
+            option_type, strike_price, volatility, days_to_expiration
+        )
 
-        # Option payoff
-        option_type_ql = (
-            ql.Option.Call if option_type.lower() == "call" else ql.Option.Put
+
+class GreeksCache:
+    """
+    Bounded LRU cache in front of `OptionGreeksCalculator`.
+
+    Keys are the pricing inputs, optionally rounded per field through
+    `decimals` (e.g. {"underlying_price": 2, "volatility": 3}) so nearly
+    identical contracts share an entry. Misses are priced with the rounded
+    inputs, so a cached value only depends on its key.
+    """
+
+    fields = (
+        "option_type",
+        "underlying_price",
+        "strike_price",
+        "risk_free_rate",
+        "volatility",
+        "dividend_yield",
+        "days_to_expiration",
+    )
+
+    def __init__(
+        self,
+        calculator: OptionGreeksCalculator = None,
+        maxsize: int = 50000,
+        decimals: dict = None,
+    ):
+        if calculator is None:
+            calculator = OptionGreeksCalculator()
+        unknown = set(decimals or {}) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields in decimals: {sorted(unknown)}")
+        self.calculator = calculator
+        self.maxsize = maxsize
+        self.decimals = decimals or {}
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def calculate_greeks(
+        self,
+        option_type="call",
+        underlying_price=100.0,
+        strike_price=100.0,
+        risk_free_rate=0.05,
+        volatility=0.2,
+        dividend_yield=0.01,
+        days_to_expiration=30,
+    ):
+        key = self._key(
+            option_type,
+            underlying_price,
+            strike_price,
+            risk_free_rate,
+            volatility,
+            dividend_yield,
+            days_to_expiration,
         )
-        payoff = ql.PlainVanillaPayoff(option_type_ql, strike_price)
-        exercise = ql.AmericanExercise(calculation_date, expiration_date)
-        option = ql.VanillaOption(payoff, exercise)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return dict(self.cache[key])
+        self.misses += 1
+        greeks = self.calculator.calculate_greeks(*key)
+        self._store(key, greeks)
+        return dict(greeks)
 
-        # Market data
-        spot = ql.SimpleQuote(underlying_price)
-        spot_handle = ql.QuoteHandle(spot)
+    def calculate_many(self, contracts: list, compute=None) -> list:
+        """
+        Look up a batch of contracts and price only the misses.
 
-        rf_rate = ql.SimpleQuote(risk_free_rate)
-        rf_handle = ql.QuoteHandle(rf_rate)
+        `compute` receives the list of missing contract tuples and must return
+        their greeks in the same order (e.g. `calculate_greeks_parallel`).
+        """
+        keys = [self._key(*c) for c in contracts]
+        missing = []
+        for key in dict.fromkeys(keys):
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            else:
+                missing.append(key)
+        if missing:
+            if compute is None:
+                computed = [self.calculator.calculate_greeks(*k) for k in missing]
+            else:
+                computed = compute(missing)
+            fresh = dict(zip(missing, computed))
+        else:
+            fresh = {}
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
 
-        div_rate = ql.SimpleQuote(dividend_yield)
-        div_handle = ql.QuoteHandle(div_rate)
+        results = [dict(fresh[k]) if k in fresh else dict(self.cache[k]) for k in keys]
+        for key, greeks in fresh.items():
+            self._store(key, greeks)
+        return results
 
-        vol = ql.SimpleQuote(volatility)
-        vol_handle = ql.QuoteHandle(vol)
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+        }
 
-        risk_free_curve = ql.FlatForward(calculation_date, rf_handle, self.day_count)
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
 
-        dividend_curve = ql.FlatForward(calculation_date, div_handle, self.day_count)
+    def _key(self, *args) -> tuple:
+        key = []
+        for field, value in zip(self.fields, args):
+            if field == "option_type":
+                value = value.lower()
+            elif field == "days_to_expiration":
+                value = int(value)
+            else:
+                value = float(value)
+                if field in self.decimals:
+                    value = round(value, self.decimals[field])
+            key.append(value)
+        return tuple(key)
 
-        volatility_curve = ql.BlackConstantVol(
-            calculation_date, self.calendar, vol_handle, self.day_count
+    def _store(self, key: tuple, greeks: dict):
+        self.cache[key] = greeks
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+
+# One calculator per worker process so its pricing context survives across chunks.
+_worker_calculator = None
+
+
+def _calculate_greeks_chunk(contracts: list) -> list:
+    global _worker_calculator
+    if _worker_calculator is None:
+        _worker_calculator = OptionGreeksCalculator()
+    return [_worker_calculator.calculate_greeks(*c) for c in contracts]
+
+
+def calculate_greeks_parallel(
+    contracts: list,
+    workers: int = None,
+    chunk_size: int = None,
+    min_parallel: int = 200,
+    calculator: OptionGreeksCalculator = None,
+) -> list:
+    """
+    Price contracts with `OptionGreeksCalculator` across a process pool.
+
+    Parameters:
+    -----------
+    contracts : list of tuple
+        Positional arguments for `calculate_greeks`, one tuple per contract
+    workers : int
+        Number of processes, defaults to the CPU count
+    chunk_size : int
+        Contracts per task, defaults to four chunks per worker
+    min_parallel : int
+        Chains smaller than this are priced serially in-process
+    calculator : OptionGreeksCalculator
+        Calculator used for the serial fallback
+
+    Returns:
+    --------
+    list : Greek dicts in the same order as `contracts`
+    """
+    contracts = list(contracts)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(contracts) < min_parallel:
+        if calculator is None:
+            calculator = OptionGreeksCalculator()
+        return [calculator.calculate_greeks(*c) for c in contracts]
+
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(contracts) / (workers * 4)))
+    chunks = [
+        contracts[i : i + chunk_size] for i in range(0, len(contracts), chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        # map() yields results in submission order, keeping the chain aligned.
+        results = pool.map(_calculate_greeks_chunk, chunks)
+        return [greeks for chunk in results for greeks in chunk]
+
+
+class VectorizedGreeks(Greeks):
+    """
+    Black-Scholes-Merton greeks for a whole chain at once.
+
+    Extends the `Greeks` formulas with a continuous dividend yield and
+    evaluates them over NumPy arrays, so every contract of a chain is priced
+    in a single call. Outputs follow the `OptionGreeksCalculator` conventions
+    (daily theta, vega and rho per 1.00 change in vol / rate).
+    """
+
+    greek_columns = ["bs_price", "delta", "gamma", "theta", "vega", "rho"]
+
+    def __init__(self, days_in_year: int = 365, round_output: bool = True):
+        super().__init__()
+        self.days_in_year = days_in_year
+        self.round_output = round_output
+
+    def calculate_greeks(
+        self,
+        option_type,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        volatility,
+        dividend_yield,
+        days_to_expiration,
+    ) -> dict:
+        """
+        Calculate price and greeks for arrays of European options.
+
+        Parameters:
+        -----------
+        option_type : array-like of str
+            'call'/'C' or 'put'/'P' for every contract
+        underlying_price, strike_price, risk_free_rate, volatility,
+        dividend_yield, days_to_expiration : float or array-like
+            Broadcastable inputs, same meaning as in
+            `OptionGreeksCalculator.calculate_greeks`
+
+        Returns:
+        --------
+        dict : Column name -> np.ndarray for every greek in `greek_columns`
+        """
+        is_call, S, K, r, sigma, q, T = self._prepare_inputs(
+            option_type,
+            underlying_price,
+            strike_price,
+            risk_free_rate,
+            volatility,
+            dividend_yield,
+            days_to_expiration,
         )
+        # A zero volatility (common on illiquid strikes) has no time value
+        # either, so those rows get the same outputs as expired contracts.
+        live = (T > 0) & (sigma > 0)
+        T_safe = np.where(live, T, 1.0)
+        sigma_safe = np.where(live, sigma, 1.0)
 
-        # Create handles
-        rf_ts = ql.YieldTermStructureHandle(risk_free_curve)
-        div_ts = ql.YieldTermStructureHandle(dividend_curve)
-        vol_ts = ql.BlackVolTermStructureHandle(volatility_curve)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sqrt_T = np.sqrt(T_safe)
+            d1 = (np.log(S / K) + (r - q + 0.5 * sigma_safe**2) * T_safe) / (
+                sigma_safe * sqrt_T
+            )
+            d2 = d1 - sigma_safe * sqrt_T
+            df_r = np.exp(-r * T_safe)
+            df_q = np.exp(-q * T_safe)
+            pdf_d1 = norm.pdf(d1)
+            sign = np.where(is_call, 1.0, -1.0)
+            cdf_d1 = norm.cdf(sign * d1)
+            cdf_d2 = norm.cdf(sign * d2)
 
-        # Create process
-        bsm_process = ql.BlackScholesMertonProcess(spot_handle, div_ts, rf_ts, vol_ts)
+            price = sign * (S * df_q * cdf_d1 - K * df_r * cdf_d2)
+            delta = sign * df_q * cdf_d1
+            gamma = df_q * pdf_d1 / (S * sigma_safe * sqrt_T)
+            vega = S * df_q * pdf_d1 * sqrt_T
+            theta = (
+                -(S * df_q * pdf_d1 * sigma_safe / (2 * sqrt_T))
+                - sign * r * K * df_r * cdf_d2
+                + sign * q * S * df_q * cdf_d1
+            ) / self.days_in_year
+            rho = sign * K * T_safe * df_r * cdf_d2
 
-        # American options pricing engine with finite differences
-        time_steps = 200
-        grid_points = 200
-        engine = ql.FdBlackScholesVanillaEngine(bsm_process, time_steps, grid_points)
-        option.setPricingEngine(engine)
+        # Expired contracts are worth intrinsic value with no time sensitivity.
+        intrinsic = np.maximum(sign * (S - K), 0.0)
+        price = np.where(live, price, intrinsic)
+        delta = np.where(live, delta, np.where(intrinsic > 0, sign, 0.0))
+        gamma = np.where(live, gamma, 0.0)
+        theta = np.where(live, theta, 0.0)
+        vega = np.where(live, vega, 0.0)
+        rho = np.where(live, rho, 0.0)
 
-        # Calculate price and available Greeks
-        price = option.NPV()
-        delta = option.delta()
-        gamma = option.gamma()
+        return self._format_output(price, delta, gamma, theta, vega, rho)
 
-        try:
-            theta = option.theta() / 365.0  # Daily theta
-        except:
-            # Calculate theta using finite difference if method not available
-            h = 1.0 / 365.0  # One day
-            ql.Settings.instance().evaluationDate = calculation_date + 1
-            theta = (option.NPV() - price) / h
-            ql.Settings.instance().evaluationDate = calculation_date
+    def implied_volatility(
+        self,
+        option_type,
+        option_price,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        dividend_yield,
+        days_to_expiration,
+        tol: float = 1e-6,
+        max_iter: int = 100,
+        low: float = 1e-4,
+        high: float = 5.0,
+    ) -> np.ndarray:
+        """
+        Solve implied volatility for a whole chain at once.
 
-        # Calculate vega with bump and reprice (since FdEngine might not provide vega)
-        vol_bump = 0.01  # 1% volatility bump
-        vol.setValue(volatility + vol_bump)
-        option_bumped = ql.VanillaOption(payoff, exercise)
-        option_bumped.setPricingEngine(engine)
-        price_up = option_bumped.NPV()
-        vega = (price_up - price) / vol_bump
-        vol.setValue(volatility)  # Reset volatility
-
-        # Calculate rho with bump and reprice
-        rate_bump = 0.01  # 1% rate bump
-        rf_rate.setValue(risk_free_rate + rate_bump)
-        option_bumped = ql.VanillaOption(payoff, exercise)
-        option_bumped.setPricingEngine(engine)
-        price_up = option_bumped.NPV()
-        rho = (price_up - price) / rate_bump
+        Runs a vectorized Newton iteration on this engine's pricing model and
+        falls back to bisection whenever a Newton step leaves the bracket.
+        Only unconverged contracts are repriced on each iteration.
 
-        # Return the results
-        return {
-            "bs_price": round(price, 2),
-            "delta": round(delta, 4),
-            "gamma": round(gamma, 4),
-            "theta": round(theta, 4),
-            "vega": round(vega, 4),
-            "rho": round(rho, 4),
-        }
+        Returns:
+        --------
+        np.ndarray : Implied volatilities, NaN where the price is outside the
+        [low, high] volatility bounds or the contract is expired
+        """
+        is_call, S, K, r, price, q, T = self._prepare_inputs(
+            option_type,
+            underlying_price,
+            strike_price,
+            risk_free_rate,
+            option_price,
+            dividend_yield,
+            days_to_expiration,
+        )
+        shape = S.shape
+        is_call, S, K, r, price, q, T = (
+            np.ravel(x) for x in (is_call, S, K, r, price, q, T)
+        )
+        iv = np.full(S.shape, np.nan)
+        lo = np.full(S.shape, low)
+        hi = np.full(S.shape, high)
+
+        valid = (T > 0) & np.isfinite(price) & (price > 0)
+        idx = np.flatnonzero(valid)
+        inputs = lambda i: (is_call[i], S[i], K[i], r[i])
+        price_low = self._model_price(*inputs(idx), lo[idx], q[idx], T[idx])
+        price_high = self._model_price(*inputs(idx), hi[idx], q[idx], T[idx])
+        idx = idx[(price[idx] >= price_low) & (price[idx] <= price_high)]
+
+        # Brenner-Subrahmanyam at-the-money approximation as the first guess.
+        sigma = np.clip(
+            np.sqrt(2 * np.pi / T[idx]) * price[idx] / S[idx], low * 2, high / 2
+        )
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            model = self._model_price(*inputs(idx), sigma, q[idx], T[idx])
+            diff = model - price[idx]
+            done = np.abs(diff) < tol
+            iv[idx[done]] = sigma[done]
+
+            lo[idx] = np.where(diff < 0, sigma, lo[idx])
+            hi[idx] = np.where(diff > 0, sigma, hi[idx])
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                sqrt_T = np.sqrt(T[idx])
+                d1 = (
+                    np.log(S[idx] / K[idx])
+                    + (r[idx] - q[idx] + 0.5 * sigma**2) * T[idx]
+                ) / (sigma * sqrt_T)
+                vega = S[idx] * np.exp(-q[idx] * T[idx]) * norm.pdf(d1) * sqrt_T
+                step = sigma - diff / vega
+            bisect = 0.5 * (lo[idx] + hi[idx])
+            outside = ~np.isfinite(step) | (step <= lo[idx]) | (step >= hi[idx])
+            sigma = np.where(outside, bisect, step)[~done]
+            idx = idx[~done]
+
+        return iv.reshape(shape)
+
+    def _model_price(self, is_call, S, K, r, sigma, q, T) -> np.ndarray:
+        return self.european_price(is_call, S, K, r, sigma, q, T)
+
+    def european_price(self, is_call, S, K, r, sigma, q, T) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            T_safe = np.maximum(T, 1e-12)
+            sigma_safe = np.where(sigma > 0, sigma, 1.0)
+            sqrt_T = np.sqrt(T_safe)
+            d1 = (np.log(S / K) + (r - q + 0.5 * sigma_safe**2) * T_safe) / (
+                sigma_safe * sqrt_T
+            )
+            d2 = d1 - sigma_safe * sqrt_T
+            sign = np.where(is_call, 1.0, -1.0)
+            forward = S * np.exp(-q * T_safe) - K * np.exp(-r * T_safe)
+            price = sign * (
+                S * np.exp(-q * T_safe) * norm.cdf(sign * d1)
+                - K * np.exp(-r * T_safe) * norm.cdf(sign * d2)
+            )
+        # With no volatility the payoff is known: the discounted forward's.
+        price = np.where(sigma > 0, price, np.maximum(sign * forward, 0.0))
+        return np.where(T > 0, price, np.maximum(sign * (S - K), 0.0))
+
+    def _prepare_inputs(
+        self,
+        option_type,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        volatility,
+        dividend_yield,
+        days_to_expiration,
+    ):
+        is_call = self._is_call(option_type)
+        S, K, r, sigma, q, dte = np.broadcast_arrays(
+            *(
+                np.asarray(x, dtype=float)
+                for x in (
+                    underlying_price,
+                    strike_price,
+                    risk_free_rate,
+                    volatility,
+                    dividend_yield,
+                    days_to_expiration,
+                )
+            )
+        )
+        is_call = np.broadcast_to(is_call, S.shape)
+        return is_call, S, K, r, sigma, q, dte / self.days_in_year
+
+    def _format_output(self, price, delta, gamma, theta, vega, rho) -> dict:
+        data = dict(
+            zip(self.greek_columns, (price, delta, gamma, theta, vega, rho))
+        )
+        if self.round_output:
+            data = {
+                k: np.round(v, 2 if k == "bs_price" else 4) for k, v in data.items()
+            }
+        return data
+
+    @staticmethod
+    def _is_call(option_type) -> np.ndarray:
+        option_type = np.char.lower(np.asarray(option_type, dtype=str))
+        is_call = np.isin(option_type, ["c", "call"])
+        is_put = np.isin(option_type, ["p", "put"])
+        if not np.all(is_call | is_put):
+            raise ValueError("option_type must be 'call' or 'put'")
+        return is_call
+
+
+class BaroneAdesiWhaley(VectorizedGreeks):
+    """
+    Barone-Adesi-Whaley quadratic approximation for American options.
+
+    Prices the whole chain in closed form (the critical exercise price is
+    found with a vectorized Newton iteration) and takes the greeks from
+    batched bump-and-reprice scenarios, so a full chain costs a handful of
+    array evaluations instead of one finite-difference grid per contract.
+    """
+
+    def __init__(
+        self,
+        days_in_year: int = 365,
+        round_output: bool = True,
+        max_iter: int = 100,
+        tol: float = 1e-6,
+    ):
+        super().__init__(days_in_year, round_output)
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def calculate_greeks(
+        self,
+        option_type,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        volatility,
+        dividend_yield,
+        days_to_expiration,
+    ) -> dict:
+        is_call, S, K, r, sigma, q, T = self._prepare_inputs(
+            option_type,
+            underlying_price,
+            strike_price,
+            risk_free_rate,
+            volatility,
+            dividend_yield,
+            days_to_expiration,
+        )
+        h_S = 0.01 * S
+        # The vol bump never goes below zero; near-zero vols get a one-sided
+        # difference over the floored bump instead of a zero-width one.
+        h_sigma = np.maximum(np.minimum(0.01, 0.5 * sigma), 1e-4)
+        sigma_up = sigma + h_sigma
+        sigma_down = np.maximum(sigma - h_sigma, 0.0)
+        h_r = 0.001
+        one_day = 1 / self.days_in_year
+
+        # Every bump scenario is stacked so the chain is repriced in one pass.
+        scenarios = [
+            (S, sigma, r, T),
+            (S + h_S, sigma, r, T),
+            (S - h_S, sigma, r, T),
+            (S, sigma, r, np.maximum(T - one_day, 0.0)),
+            (S, sigma_up, r, T),
+            (S, sigma_down, r, T),
+            (S, sigma, r + h_r, T),
+            (S, sigma, r - h_r, T),
+        ]
+        n = S.size
+        stacked = [
+            np.concatenate([np.ravel(sc[i]) for sc in scenarios]) for i in range(4)
+        ]
+        tile = lambda x: np.tile(np.ravel(x), len(scenarios))
+        prices = self.american_price(
+            tile(is_call),
+            stacked[0],
+            tile(K),
+            stacked[2],
+            stacked[1],
+            tile(q),
+            stacked[3],
+        ).reshape(len(scenarios), n)
+        p, p_up, p_down, p_day, p_vol_up, p_vol_down, p_r_up, p_r_down = (
+            x.reshape(S.shape) for x in prices
+        )
+
+        live = T > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = (p_up - p_down) / (2 * h_S)
+            gamma = (p_up - 2 * p + p_down) / h_S**2
+            vega = (p_vol_up - p_vol_down) / (sigma_up - sigma_down)
+            rho = (p_r_up - p_r_down) / (2 * h_r)
+        theta = p_day - p
+
+        sign = np.where(is_call, 1.0, -1.0)
+        intrinsic = np.maximum(sign * (S - K), 0.0)
+        delta = np.where(live, delta, np.where(intrinsic > 0, sign, 0.0))
+        gamma = np.where(live, gamma, 0.0)
+        theta = np.where(live, theta, 0.0)
+        vega = np.where(live, vega, 0.0)
+        rho = np.where(live, rho, 0.0)
+        return self._format_output(p, delta, gamma, theta, vega, rho)
+
+    def _model_price(self, is_call, S, K, r, sigma, q, T) -> np.ndarray:
+        return self.american_price(is_call, S, K, r, sigma, q, T)
+
+    def american_price(self, is_call, S, K, r, sigma, q, T) -> np.ndarray:
+        price = self.european_price(is_call, S, K, r, sigma, q, T)
+        # Early exercise only has value for calls paying a dividend and for
+        # puts with a positive rate; everything else stays European.
+        live = (T > 0) & (sigma > 0) & (r > 0)
+        call_mask = live & is_call & (q > 0)
+        put_mask = live & ~is_call
+        for mask, solver in ((call_mask, self._call), (put_mask, self._put)):
+            if mask.any():
+                with np.errstate(all="ignore"):
+                    price[mask] = solver(
+                        S[mask], K[mask], r[mask], sigma[mask], q[mask], T[mask]
+                    )
+        # An American option is never worth less than exercising it now.
+        sign = np.where(is_call, 1.0, -1.0)
+        return np.maximum(price, np.maximum(sign * (S - K), 0.0))
+
+    def _call(self, S, K, r, sigma, q, T):
+        b = r - q
+        sigma_T = sigma * np.sqrt(T)
+        carry = np.exp((b - r) * T)
+        M = 2 * r / sigma**2
+        N = 2 * b / sigma**2
+        q2 = (-(N - 1) + np.sqrt((N - 1) ** 2 + 4 * M / (1 - np.exp(-r * T)))) / 2
+
+        # Seed value for the critical price from Barone-Adesi & Whaley (1987).
+        q2_inf = (-(N - 1) + np.sqrt((N - 1) ** 2 + 4 * M)) / 2
+        S_inf = K / (1 - 1 / q2_inf)
+        h2 = -(b * T + 2 * sigma_T) * K / (S_inf - K)
+        S_star = K + (S_inf - K) * (1 - np.exp(h2))
+
+        is_call = np.ones_like(S, dtype=bool)
+        S_star = np.maximum(np.nan_to_num(S_star, nan=K), K)
+        for _ in range(self.max_iter):
+            d1 = (np.log(S_star / K) + (b + 0.5 * sigma**2) * T) / sigma_T
+            rhs = (
+                self.european_price(is_call, S_star, K, r, sigma, q, T)
+                + (1 - carry * norm.cdf(d1)) * S_star / q2
+            )
+            converged = np.abs(S_star - K - rhs) / K < self.tol
+            if converged.all():
+                break
+            slope = carry * norm.cdf(d1) * (1 - 1 / q2) + (
+                1 - carry * norm.pdf(d1) / sigma_T
+            ) / q2
+            S_star = (K + rhs - slope * S_star) / (1 - slope)
+            # The critical price of a call is never below the strike.
+            S_star = np.maximum(np.nan_to_num(S_star, nan=K), K)
+
+        d1 = (np.log(S_star / K) + (b + 0.5 * sigma**2) * T) / sigma_T
+        A2 = S_star / q2 * (1 - carry * norm.cdf(d1))
+        european = self.european_price(is_call, S, K, r, sigma, q, T)
+        price = np.where(S < S_star, european + A2 * (S / S_star) ** q2, S - K)
+        return self._settle(price, european, converged, S - K)
+
+    def _put(self, S, K, r, sigma, q, T):
+        b = r - q
+        sigma_T = sigma * np.sqrt(T)
+        carry = np.exp((b - r) * T)
+        M = 2 * r / sigma**2
+        N = 2 * b / sigma**2
+        q1 = (-(N - 1) - np.sqrt((N - 1) ** 2 + 4 * M / (1 - np.exp(-r * T)))) / 2
+
+        q1_inf = (-(N - 1) - np.sqrt((N - 1) ** 2 + 4 * M)) / 2
+        S_inf = K / (1 - 1 / q1_inf)
+        h1 = (b * T - 2 * sigma_T) * K / (K - S_inf)
+        S_star = S_inf + (K - S_inf) * np.exp(h1)
+
+        is_call = np.zeros_like(S, dtype=bool)
+        S_star = self._put_bounds(S_star, K)
+        for _ in range(self.max_iter):
+            d1 = (np.log(S_star / K) + (b + 0.5 * sigma**2) * T) / sigma_T
+            rhs = (
+                self.european_price(is_call, S_star, K, r, sigma, q, T)
+                - (1 - carry * norm.cdf(-d1)) * S_star / q1
+            )
+            converged = np.abs(K - S_star - rhs) / K < self.tol
+            if converged.all():
+                break
+            slope = -carry * norm.cdf(-d1) * (1 - 1 / q1) - (
+                1 + carry * norm.pdf(-d1) / sigma_T
+            ) / q1
+            S_star = self._put_bounds((K - rhs + slope * S_star) / (1 + slope), K)
+
+        d1 = (np.log(S_star / K) + (b + 0.5 * sigma**2) * T) / sigma_T
+        A1 = -S_star / q1 * (1 - carry * norm.cdf(-d1))
+        european = self.european_price(is_call, S, K, r, sigma, q, T)
+        price = np.where(S > S_star, european + A1 * (S / S_star) ** q1, K - S)
+        return self._settle(price, european, converged, K - S)
+
+    @staticmethod
+    def _put_bounds(S_star, K):
+        # The critical price of a put lies between zero and the strike.
+        return np.clip(np.nan_to_num(S_star, nan=K), 1e-8 * K, K)
+
+    @staticmethod
+    def _settle(price, european, converged, exercise):
+        # Contracts whose critical price didn't converge (typically very low
+        # vols) fall back to the European price, floored at intrinsic value.
+        price = np.where(converged & np.isfinite(price), price, european)
+        return np.maximum(price, np.maximum(european, exercise))
+
+    def accuracy_report(
+        self,
+        option_type,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        volatility,
+        dividend_yield,
+        days_to_expiration,
+        calculator=None,
+        detailed: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Compare the approximation against the finite-difference engine.
+
+        Every contract is priced both ways; the report holds the absolute and
+        relative error per greek. With `detailed=True` the per-contract values
+        are returned instead of the summary.
+        """
+        if calculator is None:
+            calculator = OptionGreeksCalculator()
+        fast = pd.DataFrame(
+            self.calculate_greeks(
+                option_type,
+                underlying_price,
+                strike_price,
+                risk_free_rate,
+                volatility,
+                dividend_yield,
+                days_to_expiration,
+            )
+        )
+        inputs = pd.DataFrame(
+            {
+                "type": option_type,
+                "S": underlying_price,
+                "K": strike_price,
+                "r": risk_free_rate,
+                "sigma": volatility,
+                "q": dividend_yield,
+                "dte": days_to_expiration,
+            },
+            index=fast.index,
+        )
+        reference = pd.DataFrame(
+            [
+                calculator.calculate_greeks(
+                    row.type, row.S, row.K, row.r, row.sigma, row.q, int(row.dte)
+                )
+                for row in inputs.itertuples()
+            ],
+            index=fast.index,
+        )
+        abs_error = (fast - reference).abs()
+        if detailed:
+            return pd.concat(
+                {
+                    "inputs": inputs,
+                    "baw": fast,
+                    "fd": reference,
+                    "abs_error": abs_error,
+                },
+                axis=1,
+            )
+        rel_error = abs_error / reference.abs().where(reference.abs() > 1e-8)
+        return pd.DataFrame(
+            {
+                "mean_abs_error": abs_error.mean(),
+                "max_abs_error": abs_error.max(),
+                "mean_rel_error": rel_error.mean(),
+            }
+        )
+
+
+class BinomialLattice(VectorizedGreeks):
+    """
+    Cox-Ross-Rubinstein tree evaluated for many contracts at once.
+
+    Each contract is one row of a 2D array of tree nodes, so a whole
+    expiration's strikes (or a whole chain, since every row carries its own
+    time step) walk back through the lattice together. Price, delta, gamma
+    and theta are read off the first nodes of that single tree; vega and rho
+    come from the same batched walk with bumped inputs stacked on.
+    """
+
+    def __init__(
+        self, steps: int = 200, days_in_year: int = 365, round_output: bool = True
+    ):
+        if steps < 2:
+            raise ValueError("steps must be at least 2 to read gamma and theta")
+        super().__init__(days_in_year, round_output)
+        self.steps = steps
+
+    def calculate_greeks(
+        self,
+        option_type,
+        underlying_price,
+        strike_price,
+        risk_free_rate,
+        volatility,
+        dividend_yield,
+        days_to_expiration,
+    ) -> dict:
+        is_call, S, K, r, sigma, q, T = self._prepare_inputs(
+            option_type,
+            underlying_price,
+            strike_price,
+            risk_free_rate,
+            volatility,
+            dividend_yield,
+            days_to_expiration,
+        )
+        # Same forward bumps as OptionGreeksCalculator.
+        vol_bump, rate_bump = 0.01, 0.01
+        n = S.size
+        stack = lambda *xs: np.concatenate([np.ravel(x) for x in xs])
+        price, delta, gamma, theta = self.price_tree(
+            stack(is_call, is_call, is_call),
+            stack(S, S, S),
+            stack(K, K, K),
+            stack(r, r, r + rate_bump),
+            stack(sigma, sigma + vol_bump, sigma),
+            stack(q, q, q),
+            stack(T, T, T),
+        )
+        base = slice(0, n)
+        vega = (price[n : 2 * n] - price[base]) / vol_bump
+        rho = (price[2 * n :] - price[base]) / rate_bump
+        return self._format_output(
+            *(
+                x.reshape(S.shape)
+                for x in (
+                    price[base],
+                    delta[base],
+                    gamma[base],
+                    theta[base] / self.days_in_year,
+                    vega,
+                    rho,
+                )
+            )
+        )
+
+    def _model_price(self, is_call, S, K, r, sigma, q, T) -> np.ndarray:
+        return self.price_tree(is_call, S, K, r, sigma, q, T)[0]
+
+    def price_tree(self, is_call, S, K, r, sigma, q, T):
+        """
+        Walk the lattice backwards for every contract at once.
+
+        Returns:
+        --------
+        tuple : (price, delta, gamma, theta) arrays, theta per year
+        """
+        is_call, S, K, r, sigma, q, T = (
+            np.ravel(x) for x in np.broadcast_arrays(is_call, S, K, r, sigma, q, T)
+        )
+        N = self.steps
+        live = T > 0
+        dt = np.where(live, T, 1.0) / N
+        # The CRR probability leaves [0, 1] once the carry per step outgrows
+        # the volatility per step (near-zero IVs); those rows are priced
+        # without the tree below.
+        degenerate = live & (sigma * np.sqrt(dt) <= np.abs(r - q) * dt)
+        tree_sigma = np.where(degenerate, 1.0, sigma)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = np.exp(tree_sigma * np.sqrt(dt))
+            d = 1 / u
+            p = (np.exp((r - q) * dt) - d) / (u - d)
+        disc = np.exp(-r * dt)
+        sign = np.where(is_call, 1.0, -1.0)[:, None]
+        u_col, p_col, disc_col, K_col = u[:, None], p[:, None], disc[:, None], K[:, None]
+
+        # Terminal nodes S * u^(2j - N), then step back one level at a time.
+        ST = S[:, None] * u_col ** (2 * np.arange(N + 1) - N)
+        vals = np.maximum(sign * (ST - K_col), 0.0)
+        for i in range(N - 1, -1, -1):
+            ST = ST[:, : i + 1] * u_col
+            cont = disc_col * (p_col * vals[:, 1:] + (1 - p_col) * vals[:, :-1])
+            vals = np.maximum(cont, sign * (ST - K_col))
+            if i == 2:
+                S2, V2 = ST, vals
+            elif i == 1:
+                S1, V1 = ST, vals
+
+        price = vals[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = (V1[:, 1] - V1[:, 0]) / (S1[:, 1] - S1[:, 0])
+            delta_up = (V2[:, 2] - V2[:, 1]) / (S2[:, 2] - S2[:, 1])
+            delta_down = (V2[:, 1] - V2[:, 0]) / (S2[:, 1] - S2[:, 0])
+            gamma = (delta_up - delta_down) / (0.5 * (S2[:, 2] - S2[:, 0]))
+            theta = (V2[:, 1] - price) / (2 * dt)
+
+        sign = sign[:, 0]
+        intrinsic = np.maximum(sign * (S - K), 0.0)
+        european = self.european_price(is_call, S, K, r, np.maximum(sigma, 0.0), q, T)
+        price = np.where(degenerate, np.maximum(european, intrinsic), price)
+        tree = live & ~degenerate
+        price = np.where(live, price, intrinsic)
+        delta = np.where(tree, delta, np.where(intrinsic > 0, sign, 0.0))
+        gamma = np.where(tree, gamma, 0.0)
+        theta = np.where(tree, theta, 0.0)
+        return price, delta, gamma, theta
@@ -0,0 +1,201 @@
+"""
+Batch versions of the `technical_analysis` indicators.
+
+Every function takes closes aligned as a dates x tickers DataFrame and
+computes all columns in one pass. Results follow pandas_ta's own formulas
+(SMA seeded EMA, Wilder RMA for RSI, ddof=0 Bollinger bands) and column
+names, applied to each ticker from its first valid close.
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from utils import technical_analysis as ta
+
+
+def align_closes(
+    frames: dict, column: str = "Close", fill: bool = True
+) -> pd.DataFrame:
+    """
+    Outer-join one column of several candle frames into a dates x tickers
+    frame. With `fill`, gaps inside a ticker's history (exchange holidays,
+    missing bars) are forward filled; leading and trailing gaps stay NaN.
+    """
+    closes = pd.concat(
+        {ticker: df[column] for ticker, df in frames.items() if not df.empty},
+        axis=1,
+    )
+    closes.index = pd.to_datetime(closes.index)
+    closes = closes.sort_index()
+    if fill:
+        closes = closes.ffill().where(closes.bfill().notna())
+    return closes
+
+
+def sma(close: pd.DataFrame, length: int = 10) -> pd.DataFrame:
+    return close.rolling(length, min_periods=length).mean()
+
+
+def ema(close: pd.DataFrame, length: int = 10) -> pd.DataFrame:
+    # pandas_ta seeds the EMA with the SMA of each series' first `length`
+    # values and runs ewm(adjust=False) from there.
+    values = close.to_numpy(dtype=float, copy=True)
+    rows = len(values)
+    seed_rows = _first_valid(values) + length - 1
+    seeds = sma(close, length).to_numpy()
+    values[np.arange(rows)[:, None] < seed_rows] = np.nan
+    seeded = np.nonzero(seed_rows < rows)[0]
+    values[seed_rows[seeded], seeded] = seeds[seed_rows[seeded], seeded]
+    seeded_close = pd.DataFrame(values, index=close.index, columns=close.columns)
+    return seeded_close.ewm(span=length, adjust=False).mean()
+
+
+def rsi(close: pd.DataFrame, length: int = 14) -> pd.DataFrame:
+    change = close.diff()
+    positive = _rma(change.clip(lower=0), length)
+    negative = _rma(change.clip(upper=0), length)
+    return 100 * positive / (positive + negative.abs())
+
+
+def macd(
+    close: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9
+) -> dict:
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    suffix = f"{fast}_{slow}_{signal}"
+    return {
+        f"MACD_{suffix}": line,
+        f"MACDh_{suffix}": line - signal_line,
+        f"MACDs_{suffix}": signal_line,
+    }
+
+
+def bbands(
+    close: pd.DataFrame, length: int = 20, std: float = 2.0, ddof: int = 0
+) -> dict:
+    mid = sma(close, length)
+    deviations = std * close.rolling(length, min_periods=length).std(ddof=ddof)
+    lower = mid - deviations
+    upper = mid + deviations
+    width = _non_zero_range(upper, lower)
+    suffix = f"{length}_{float(std)}"
+    return {
+        f"BBL_{suffix}": lower,
+        f"BBM_{suffix}": mid,
+        f"BBU_{suffix}": upper,
+        f"BBB_{suffix}": 100 * width / mid,
+        f"BBP_{suffix}": _non_zero_range(close, lower) / width,
+    }
+
+
+INDICATORS = {
+    "sma": (sma, lambda p: f"SMA_{p.get('length', 10)}"),
+    "ema": (ema, lambda p: f"EMA_{p.get('length', 10)}"),
+    "rsi": (rsi, lambda p: f"RSI_{p.get('length', 14)}"),
+    "macd": (macd, None),
+    "bbands": (bbands, None),
+}
+
+DEFAULT_INDICATORS = [
+    ("rsi", {"length": 14}),
+    ("sma", {"length": 20}),
+    ("ema", {"length": 20}),
+    ("macd", {"fast": 12, "slow": 26, "signal": 9}),
+    ("bbands", {"length": 20}),
+]
+
+
+def compute_indicators(
+    close: pd.DataFrame, indicators: list = None, layout: str = "wide"
+) -> pd.DataFrame:
+    """
+    Compute several indicators over every ticker in one pass.
+
+    Parameters:
+    -----------
+    close : pd.DataFrame
+        Closes as dates x tickers, see `align_closes`
+    indicators : list
+        (name, params) pairs with names from `INDICATORS`, defaults to
+        `DEFAULT_INDICATORS`
+    layout : str
+        "wide" for (indicator, ticker) columns, "long" for a
+        (Date, ticker) index with one column per indicator
+
+    Returns:
+    --------
+    pd.DataFrame : Indicator values in the requested layout
+    """
+    if layout not in ("wide", "long"):
+        raise ValueError(f"layout must be 'wide' or 'long', got '{layout}'")
+    results = {}
+    for name, params in indicators or DEFAULT_INDICATORS:
+        func, column_name = INDICATORS[name]
+        output = func(close, **params)
+        if isinstance(output, dict):
+            results.update(output)
+        else:
+            results[column_name(params)] = output
+    wide = pd.concat(results, axis=1, names=["indicator", "ticker"])
+    if layout == "wide":
+        return wide
+    long = wide.stack(level="ticker", future_stack=True)
+    long.index = long.index.set_names(["Date", "ticker"])
+    return long.dropna(how="all")
+
+
+def benchmark(close: pd.DataFrame, repeat: int = 3) -> pd.DataFrame:
+    """
+    Time `compute_indicators` against the per-series `technical_analysis`
+    wrappers on the same closes and report the largest absolute difference
+    per indicator.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch = compute_indicators(close)
+    batch_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        series = {}
+        for ticker in close.columns:
+            s = close[ticker].dropna()
+            series[("RSI_14", ticker)] = ta.get_RSI(s, 14)
+            series[("SMA_20", ticker)] = ta.get_SMA(s, 20)
+            series[("EMA_20", ticker)] = ta.get_EMA(s, 20)
+            for name, values in ta.get_MACD(s).items():
+                series[(name, ticker)] = values
+            for name, values in ta.get_BBands(s, 20).items():
+                series[(name, ticker)] = values
+    wrapper_time = (time.perf_counter() - start) / repeat
+
+    report = []
+    for name in batch.columns.get_level_values("indicator").unique():
+        diffs = [
+            (batch[(name, t)] - series[(name, t)]).abs().max()
+            for t in close.columns
+            if (name, t) in series
+        ]
+        report.append({"indicator": name, "max_abs_diff": np.nanmax(diffs)})
+    report = pd.DataFrame(report).set_index("indicator")
+    report.attrs["batch_seconds"] = batch_time
+    report.attrs["wrapper_seconds"] = wrapper_time
+    report.attrs["speedup"] = wrapper_time / batch_time
+    return report
+
+
+def _rma(values: pd.DataFrame, length: int) -> pd.DataFrame:
+    return values.ewm(alpha=1 / length, min_periods=length).mean()
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    # Row of each column's first non-NaN value, len(values) when there's none.
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+
+
+def _non_zero_range(high: pd.DataFrame, low: pd.DataFrame) -> pd.DataFrame:
+    # pandas_ta nudges a whole series by epsilon when any of its range is zero.
+    diff = high - low
+    return diff + sys.float_info.epsilon * diff.eq(0).any()
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from utils import indicators
+
+
+def cross(a, b, above: bool = True) -> np.ndarray:
+    """
+    Boolean dates x tickers array marking where `a` crosses `b`.
+
+    Same rule as `technical_analysis.get_cross` (pandas_ta's cross): above
+    means a > b now and a < b on the previous row. Below is the mirror
+    image, a < b now and a > b before. `b` may be a scalar threshold.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.broadcast_to(np.asarray(b, dtype=float), a.shape)
+    crossed = np.zeros(a.shape, dtype=bool)
+    if above:
+        crossed[1:] = (a[1:] > b[1:]) & (a[:-1] < b[:-1])
+    else:
+        crossed[1:] = (a[1:] < b[1:]) & (a[:-1] > b[:-1])
+    return crossed
+
+
+class SignalScanner:
+    """
+    Evaluates crossover and threshold rules over a whole universe at once.
+
+    `close` is a dates x tickers frame (see `indicators.align_closes`).
+    Indicators are computed once per parameter set with the batch engine
+    and shared by every rule that needs them.
+    """
+
+    signals = [
+        "golden_cross",
+        "death_cross",
+        "macd_bullish_cross",
+        "macd_bearish_cross",
+        "bbands_upper_break",
+        "bbands_lower_break",
+        "rsi_overbought",
+        "rsi_oversold",
+    ]
+
+    def __init__(
+        self,
+        close: pd.DataFrame,
+        fast_sma: int = 50,
+        slow_sma: int = 200,
+        rsi_length: int = 14,
+        rsi_upper: float = 70,
+        rsi_lower: float = 30,
+        bbands_length: int = 20,
+        bbands_std: float = 2.0,
+    ):
+        self.close = close
+        self.fast_sma = fast_sma
+        self.slow_sma = slow_sma
+        self.rsi_length = rsi_length
+        self.rsi_upper = rsi_upper
+        self.rsi_lower = rsi_lower
+        self.bbands_length = bbands_length
+        self.bbands_std = bbands_std
+        self.computed = {}
+
+    def indicator(self, name: str, **params):
+        key = (name, tuple(sorted(params.items())))
+        if key not in self.computed:
+            func = indicators.INDICATORS[name][0]
+            self.computed[key] = func(self.close, **params)
+        return self.computed[key]
+
+    def scan(self, signals: list = None, start=None) -> pd.DataFrame:
+        """
+        Every (date, ticker, signal) that triggered.
+
+        Parameters:
+        -----------
+        signals : list
+            Names from `signals`, or (name, func) pairs where func takes the
+            scanner and returns a boolean dates x tickers array, defaults to
+            every built-in signal
+        start : str or pd.Timestamp
+            Only report triggers on or after this date
+
+        Returns:
+        --------
+        pd.DataFrame : Columns Date, ticker, signal sorted by date
+        """
+        first_row = 0
+        if start is not None:
+            first_row = self.close.index.searchsorted(pd.Timestamp(start))
+        frames = []
+        for signal in signals or self.signals:
+            if isinstance(signal, tuple):
+                name, rule = signal
+                mask = rule(self)
+            else:
+                name = signal
+                mask = getattr(self, name)()
+            rows, cols = np.nonzero(np.asarray(mask)[first_row:])
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "Date": self.close.index[rows + first_row],
+                        "ticker": self.close.columns[cols],
+                        "signal": name,
+                    }
+                )
+            )
+        hits = pd.concat(frames, ignore_index=True)
+        return hits.sort_values(
+            ["Date", "ticker"], kind="mergesort", ignore_index=True
+        )
+
+    def latest(self, signals: list = None) -> pd.DataFrame:
+        return self.scan(signals, start=self.close.index[-1])
+
+    ### Rules
+    def golden_cross(self) -> np.ndarray:
+        fast = self.indicator("sma", length=self.fast_sma)
+        slow = self.indicator("sma", length=self.slow_sma)
+        return cross(fast, slow)
+
+    def death_cross(self) -> np.ndarray:
+        fast = self.indicator("sma", length=self.fast_sma)
+        slow = self.indicator("sma", length=self.slow_sma)
+        return cross(fast, slow, above=False)
+
+    def macd_bullish_cross(self) -> np.ndarray:
+        macd = self.indicator("macd")
+        return cross(macd["MACD_12_26_9"], macd["MACDs_12_26_9"])
+
+    def macd_bearish_cross(self) -> np.ndarray:
+        macd = self.indicator("macd")
+        return cross(macd["MACD_12_26_9"], macd["MACDs_12_26_9"], above=False)
+
+    def bbands_upper_break(self) -> np.ndarray:
+        bands = self._bbands()
+        return cross(self.close, bands[f"BBU_{self._bbands_suffix()}"])
+
+    def bbands_lower_break(self) -> np.ndarray:
+        bands = self._bbands()
+        lower = bands[f"BBL_{self._bbands_suffix()}"]
+        return cross(self.close, lower, above=False)
+
+    def rsi_overbought(self) -> np.ndarray:
+        rsi = self.indicator("rsi", length=self.rsi_length)
+        return cross(rsi, self.rsi_upper)
+
+    def rsi_oversold(self) -> np.ndarray:
+        rsi = self.indicator("rsi", length=self.rsi_length)
+        return cross(rsi, self.rsi_lower, above=False)
+
+    def _bbands(self) -> dict:
+        return self.indicator(
+            "bbands", length=self.bbands_length, std=self.bbands_std
+        )
+
+    def _bbands_suffix(self) -> str:
+        return f"{self.bbands_length}_{float(self.bbands_std)}"
@@ -0,0 +1,285 @@
+"""
+Incremental versions of the `technical_analysis` indicators.
+
+Each indicator keeps just enough state to fold in one new close in
+constant time, using the same formulas as pandas_ta (see
+`utils.indicators`). Seed one from history with `seed` or `from_candles`,
+then call `update` per bar; `update(close, replace=True)` revises the last
+bar instead, for a bar that is still forming. `state_dict`/`from_state`
+round-trip the state through JSON-friendly dicts.
+"""
+import sys
+import math
+from collections import deque
+
+
+class StreamingIndicator:
+    state_fields = ()
+
+    def __init__(self, **params):
+        self.params = params
+        self.previous = None
+
+    def update(self, close: float, replace: bool = False):
+        close = float(close)
+        if replace and self.previous is not None:
+            self._restore(self.previous)
+        else:
+            self.previous = self._snapshot()
+        self.previous["updated"] = not math.isnan(close)
+        if self.previous["updated"]:
+            self._update(close)
+        return self.value
+
+    def seed(self, closes):
+        for close in closes:
+            self.update(close)
+        return self
+
+    @classmethod
+    def from_candles(cls, candles, column: str = "Close", **params):
+        closes = candles.get_candles()[column].dropna()
+        return cls(**params).seed(closes.to_numpy())
+
+    @property
+    def value(self):
+        raise NotImplementedError
+
+    def _update(self, close: float):
+        raise NotImplementedError
+
+    def state_dict(self) -> dict:
+        state = {"type": type(self).__name__, "params": dict(self.params)}
+        for field in self.state_fields:
+            value = getattr(self, field)
+            if isinstance(value, StreamingIndicator):
+                value = value.state_dict()
+            elif isinstance(value, deque):
+                value = list(value)
+            state[field] = value
+        return state
+
+    def load_state(self, state: dict):
+        for field in self.state_fields:
+            current = getattr(self, field)
+            if isinstance(current, StreamingIndicator):
+                current.load_state(state[field])
+            elif isinstance(current, deque):
+                setattr(self, field, deque(state[field], maxlen=current.maxlen))
+            else:
+                setattr(self, field, state[field])
+        return self
+
+    def _snapshot(self) -> dict:
+        # Just enough to undo one update: the scalar fields and the value
+        # each full window is about to evict.
+        snapshot = {}
+        for field in self.state_fields:
+            value = getattr(self, field)
+            if isinstance(value, StreamingIndicator):
+                value = value._snapshot()
+            elif isinstance(value, deque):
+                value = value[0] if len(value) == value.maxlen else None
+            snapshot[field] = value
+        return snapshot
+
+    def _restore(self, snapshot: dict):
+        if "type" in snapshot:  # Full state_dict saved by older caches.
+            self.load_state(snapshot)
+            return
+        updated = snapshot.get("updated", True)
+        for field in self.state_fields:
+            current, value = getattr(self, field), snapshot[field]
+            if isinstance(current, StreamingIndicator):
+                current._restore({**value, "updated": updated})
+            elif isinstance(current, deque):
+                if updated:
+                    current.pop()
+                    if value is not None:
+                        current.appendleft(value)
+            else:
+                setattr(self, field, value)
+
+    @classmethod
+    def from_state(cls, state: dict):
+        indicator = STREAMING_INDICATORS[state["type"]](**state["params"])
+        return indicator.load_state(state)
+
+
+class StreamingSMA(StreamingIndicator):
+    state_fields = ("window", "total")
+
+    def __init__(self, length: int = 10):
+        super().__init__(length=length)
+        self.length = length
+        self.name = f"SMA_{length}"
+        self.window = deque(maxlen=length)
+        self.total = 0.0
+
+    def _update(self, close: float):
+        if len(self.window) == self.length:
+            self.total -= self.window[0]
+        self.window.append(close)
+        self.total += close
+
+    @property
+    def value(self) -> float:
+        if len(self.window) < self.length:
+            return math.nan
+        return self.total / self.length
+
+
+class StreamingEMA(StreamingIndicator):
+    state_fields = ("count", "total", "ema")
+
+    def __init__(self, length: int = 10):
+        super().__init__(length=length)
+        self.length = length
+        self.name = f"EMA_{length}"
+        self.alpha = 2 / (length + 1)
+        self.count = 0
+        self.total = 0.0
+        self.ema = math.nan
+
+    def _update(self, close: float):
+        # Seeded with the SMA of the first `length` closes, like pandas_ta.
+        self.count += 1
+        if self.count < self.length:
+            self.total += close
+        elif self.count == self.length:
+            self.ema = (self.total + close) / self.length
+        else:
+            self.ema = self.alpha * close + (1 - self.alpha) * self.ema
+
+    @property
+    def value(self) -> float:
+        return self.ema
+
+
+class StreamingRSI(StreamingIndicator):
+    state_fields = ("last_close", "count", "gain", "loss", "weight")
+
+    def __init__(self, length: int = 14):
+        super().__init__(length=length)
+        self.length = length
+        self.name = f"RSI_{length}"
+        self.decay = 1 - 1 / length
+        self.last_close = None
+        self.count = 0
+        # Wilder RMA as pandas' ewm(adjust=True): weighted sums over the
+        # shared sum of weights.
+        self.gain = 0.0
+        self.loss = 0.0
+        self.weight = 0.0
+
+    def _update(self, close: float):
+        if self.last_close is not None:
+            change = close - self.last_close
+            self.gain = max(change, 0.0) + self.decay * self.gain
+            self.loss = min(change, 0.0) + self.decay * self.loss
+            self.weight = 1.0 + self.decay * self.weight
+            self.count += 1
+        self.last_close = close
+
+    @property
+    def value(self) -> float:
+        if self.count < self.length:
+            return math.nan
+        gain = self.gain / self.weight
+        loss = abs(self.loss / self.weight)
+        if gain + loss == 0:
+            return math.nan
+        return 100 * gain / (gain + loss)
+
+
+class StreamingMACD(StreamingIndicator):
+    state_fields = ("fast_ema", "slow_ema", "signal_ema")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__(fast=fast, slow=slow, signal=signal)
+        self.suffix = f"{fast}_{slow}_{signal}"
+        self.name = f"MACD_{self.suffix}"
+        self.fast_ema = StreamingEMA(fast)
+        self.slow_ema = StreamingEMA(slow)
+        self.signal_ema = StreamingEMA(signal)
+
+    def _update(self, close: float):
+        self.fast_ema._update(close)
+        self.slow_ema._update(close)
+        # The signal line starts at the first defined MACD value.
+        line = self.fast_ema.value - self.slow_ema.value
+        if not math.isnan(line):
+            self.signal_ema._update(line)
+
+    @property
+    def value(self) -> dict:
+        line = self.fast_ema.value - self.slow_ema.value
+        signal = self.signal_ema.value
+        return {
+            f"MACD_{self.suffix}": line,
+            f"MACDh_{self.suffix}": line - signal,
+            f"MACDs_{self.suffix}": signal,
+        }
+
+
+class StreamingBBands(StreamingIndicator):
+    state_fields = ("window", "shift", "total", "total_squares", "updates")
+
+    def __init__(self, length: int = 20, std: float = 2.0, ddof: int = 0):
+        super().__init__(length=length, std=std, ddof=ddof)
+        self.length = length
+        self.std = std
+        self.ddof = ddof
+        self.suffix = f"{length}_{float(std)}"
+        self.name = f"BB_{self.suffix}"
+        self.window = deque(maxlen=length)
+        # Sums are kept around a recent close to limit cancellation and
+        # rebuilt from the window every `length` bars to stop drift.
+        self.shift = None
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.updates = 0
+
+    def _update(self, close: float):
+        if self.shift is None:
+            self.shift = close
+        if len(self.window) == self.length:
+            old = self.window[0] - self.shift
+            self.total -= old
+            self.total_squares -= old * old
+        self.window.append(close)
+        new = close - self.shift
+        self.total += new
+        self.total_squares += new * new
+        self.updates += 1
+        if self.updates % self.length == 0:
+            self.shift = self.window[0]
+            deviations = [x - self.shift for x in self.window]
+            self.total = sum(deviations)
+            self.total_squares = sum(d * d for d in deviations)
+
+    @property
+    def value(self) -> dict:
+        names = ["BBL", "BBM", "BBU", "BBB", "BBP"]
+        if len(self.window) < self.length:
+            return {f"{n}_{self.suffix}": math.nan for n in names}
+        n = self.length
+        variance = max(self.total_squares - self.total**2 / n, 0.0) / (n - self.ddof)
+        mid = self.shift + self.total / n
+        deviation = self.std * math.sqrt(variance)
+        lower, upper = mid - deviation, mid + deviation
+        width = (upper - lower) or sys.float_info.epsilon
+        values = [lower, mid, upper, 100 * width / mid, (self.window[-1] - lower) / width]
+        return {f"{n}_{self.suffix}": v for n, v in zip(names, values)}
+
+
+STREAMING_INDICATORS = {
+    cls.__name__: cls
+    for cls in [
+        StreamingSMA,
+        StreamingEMA,
+        StreamingRSI,
+        StreamingMACD,
+        StreamingBBands,
+    ]
+}
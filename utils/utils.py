@@ -33,14 +33,130 @@ def calc_dte(expiration_date, today: str = ""):
 
 
 def handle_growth(values: pd.Series):
-    index = 0
-    growth = []
-    for i, row in values.items():
-        if index == 0:
-            growth.append(np.nan)
+    previous = values.shift(1)
+    return ((values - previous) / previous * 100).tolist()
+
+
+def _period_high(columns, starts, ends):
+    return _reduce_periods(np.fmax, columns["High"], starts, ends)
+
+
+def _period_low(columns, starts, ends):
+    return _reduce_periods(np.fmin, columns["Low"], starts, ends)
+
+
+def _period_average(columns, starts, ends):
+    return _period_mean(columns["Close"], starts, ends)
+
+
+def _period_vwap(columns, starts, ends):
+    # Typical price (high + low + close) / 3 weighted by volume.
+    typical = (columns["High"] + columns["Low"] + columns["Close"]) / 3
+    volume = columns["Volume"]
+    traded = _period_sum(typical * volume, starts, ends)
+    total = _period_sum(np.where(np.isnan(typical), np.nan, volume), starts, ends)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, traded / total, np.nan)
+
+
+def _period_realized_vol(columns, starts, ends):
+    # Annualized std of the daily log returns between bars in the window.
+    close = columns["Close"]
+    returns = np.full(len(close), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns[1:] = np.log(close[1:] / close[:-1])
+    # A window's first bar has no return inside the window.
+    starts = np.minimum(starts + 1, np.maximum(ends, starts))
+    count = _period_sum(~np.isnan(returns), starts, ends)
+    total = _period_sum(returns, starts, ends)
+    squares = _period_sum(returns**2, starts, ends)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - total**2 / count) / (count - 1)
+    variance = np.where(count > 1, np.maximum(variance, 0), np.nan)
+    return np.sqrt(variance * 252)
+
+
+PERIOD_AGGREGATES = {
+    "high": _period_high,
+    "low": _period_low,
+    "average": _period_average,
+    "vwap": _period_vwap,
+    "realized_vol": _period_realized_vol,
+}
+
+
+def aggregate_periods(
+    candles: pd.DataFrame, dates: list, aggregates=("high", "low", "average")
+) -> pd.DataFrame:
+    """
+    Aggregate candles over the windows between consecutive dates in one pass.
+
+    Row k covers every bar from dates[k - 1] through dates[k], both ends
+    included like a `.loc[prev:date]` slice; row 0 has no window and is NaN.
+
+    Parameters:
+    -----------
+    candles : pd.DataFrame
+        OHLCV bars, the index may be dates or date strings
+    dates : list
+        Ascending period end dates, e.g. statement columns
+    aggregates : iterable
+        Names from `PERIOD_AGGREGATES`, or (name, column, ufunc) tuples
+        reduced with `ufunc.reduceat`, e.g. ("volume", "Volume", np.add)
+
+    Returns:
+    --------
+    pd.DataFrame : One row per date, one column per aggregate
+    """
+    index = pd.to_datetime(candles.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    order = np.argsort(index.to_numpy(), kind="stable")
+    bars = index.to_numpy()[order]
+    bounds = pd.to_datetime(pd.Index(dates)).to_numpy()
+    # [start, end) rows for each window, end inclusive of the last date.
+    starts = np.searchsorted(bars, bounds[:-1], side="left")
+    ends = np.searchsorted(bars, bounds[1:], side="right")
+
+    columns = {
+        c: candles[c].to_numpy(dtype=float)[order]
+        for c in ["High", "Low", "Close", "Volume"]
+        if c in candles
+    }
+    result = {}
+    for aggregate in aggregates:
+        if isinstance(aggregate, str):
+            values = PERIOD_AGGREGATES[aggregate](columns, starts, ends)
         else:
-            last_val = values.iloc[index - 1]
-            change = (row - last_val) / last_val * 100
-            growth.append(change)
-        index += 1
-    return growth
+            aggregate, column, ufunc = aggregate
+            data = candles[column].to_numpy(dtype=float)[order]
+            values = _reduce_periods(ufunc, data, starts, ends)
+        result[aggregate] = np.concatenate([[np.nan], values])
+    return pd.DataFrame(result, index=dates)
+
+
+def _reduce_periods(ufunc, values, starts, ends):
+    # reduceat over interleaved [start, end) pairs: every other result is a
+    # window. The sentinel keeps end == len(values) a valid index.
+    if len(starts) == 0:
+        return np.array([])
+    values = np.append(values, np.nan)
+    pairs = np.empty(2 * len(starts), dtype=np.intp)
+    pairs[0::2] = starts
+    pairs[1::2] = ends
+    reduced = ufunc.reduceat(values, pairs)[0::2]
+    # reduceat returns values[start] for empty windows.
+    return np.where(ends > starts, reduced, np.nan)
+
+
+def _period_sum(values, starts, ends):
+    totals = np.concatenate([[0.0], np.cumsum(np.nan_to_num(values, nan=0.0))])
+    window = totals[np.maximum(ends, starts)] - totals[starts]
+    return np.where(ends > starts, window, np.nan)
+
+
+def _period_mean(values, starts, ends):
+    total = _period_sum(values, starts, ends)
+    count = _period_sum(~np.isnan(values), starts, ends)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)